@@ -1,20 +1,13 @@
 import os
 import sys
-import time
 import statistics
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import load_workbook, Workbook
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from shared.data_loader.data_loader import load_data
-from shared.utils import evaluate_solution, verify_solution
-
-from random_method.heuristics import evolutionary_one_plus_one
-from constructive_method.heuristics import (
-    nearest_neighbor_minimize_max_workload_time,
-    nearest_neighbor_minimize_max_workload_time_randomized
-)
-from local_search_method.heuristics import local_search_vns
+from shared.replicates import combine_replicates, get_replicates
+from ptl.methods import DEFAULT_PARAMETERS
 
 # Parameters
 instances_list = [
@@ -28,6 +21,8 @@ instances_list = [
 
 n_random_runs = 30
 n_random_iterations = 1000
+n_grasp_runs = 30
+n_grasp_iterations = 100
 n_evolutionary_runs = 30
 evolutionary_max_iterations = 1000
 local_search_max_iterations = 1000
@@ -35,6 +30,15 @@ local_search_max_no_improve = 40
 local_search_initial_neighborhood_size = 5
 local_search_max_neighborhood_size = 10
 local_search_num_changes = 3
+n_tabu_search_runs = 1  # Deterministic: starts from the nearest neighbor solution
+tabu_search_max_iterations = 1000
+tabu_search_max_no_improve = 200
+tabu_search_tabu_tenure = 10
+n_lns_runs = 5  # Each run solves many MILP sub-problems
+lns_max_iterations = 100
+lns_max_no_improve = 10
+lns_max_subproblem_orders = 24
+lns_subproblem_time_limit = 0.5
 
 bks_file = 'analysis/find_bks/bks_results.xlsx'
 
@@ -49,27 +53,20 @@ def load_bks():
         for row in ws.iter_rows(min_row=2)
     }
 
-def evaluate_method(method_name, func, args, runs, method_kwargs=None):
-    wmax_values = []
-    wmax_wmin_values = []
-    execution_times = []
-
-    for _ in range(runs):
-        start = time.time()
-        result = func(*args, **(method_kwargs or {}))
-        assignments, load_zones, _ = result
-        elapsed_time = time.time() - start
-
-        wmax, wmax_wmin = evaluate_solution(load_zones)
+def evaluate_method(method_name, ptl_method, instance, runs, method_kwargs=None, executor=None):
+    # Seeded runs are shared with the statistics and BKS scripts through the replicate store
+    replicates = get_replicates(instance, ptl_method, method_kwargs or {}, range(runs), executor, keep_solutions=True)
+    # Best Wmax after path relinking the elite solutions of the runs
+    relinked = combine_replicates(instance, replicates)
 
-        if verify_solution(assignments, load_zones, *args[:3]):
-            wmax_values.append(wmax)
-            wmax_wmin_values.append(wmax_wmin)
-            execution_times.append(elapsed_time)
+    wmax_values = [run['wmax'] for run in replicates]
+    wmax_wmin_values = [run['wmax_wmin'] for run in replicates]
+    execution_times = [run['execution_time'] for run in replicates]
 
     return {
         'method': method_name,
         'best_wmax': round(min(wmax_values), 2),
+        'relinked_wmax': round(relinked.wmax, 2),
         'mean_wmax': round(statistics.mean(wmax_values), 2),
         'best_wmax_wmin': round(min(wmax_wmin_values), 2),
         'mean_wmax_wmin': round(statistics.mean(wmax_wmin_values), 2),
@@ -88,14 +85,15 @@ def main():
     ws.append([
         'instance', 'method',
         'bks_wmax', 'bks_wmax_wmin',
-        'best_wmax', 'mean_wmax', 'gap_wmax_percent',
+        'best_wmax', 'relinked_wmax', 'mean_wmax', 'gap_wmax_percent',
         'best_wmax_wmin', 'mean_wmax_wmin', 'gap_wmax_wmin_percent',
         'time_sec'
     ])
 
+    executor = ProcessPoolExecutor()
+
     for instance in instances_list:
         print(f"Processing instance: {instance}")
-        args = load_data(instance)
         bks = bks_dict.get(instance)
         if not bks:
             print(f"⚠️ BKS not found for {instance}, skipping.")
@@ -104,41 +102,91 @@ def main():
         # Deterministic method
         det_result = evaluate_method(
             'deterministic',
-            nearest_neighbor_minimize_max_workload_time,
-            args, 1
+            'deterministic',
+            instance, 1
+        )
+
+        # LPT and Karmarkar-Karp differencing methods
+        lpt_result = evaluate_method(
+            'lpt',
+            'lpt',
+            instance, 1
+        )
+        differencing_result = evaluate_method(
+            'differencing',
+            'differencing',
+            instance, 1
         )
 
         # Randomized method
         rand_result = evaluate_method(
             'randomized',
-            nearest_neighbor_minimize_max_workload_time_randomized,
-            args, n_random_runs,
-            {'N': n_random_iterations}
+            'randomized',
+            instance, n_random_runs,
+            {'N': n_random_iterations},
+            executor
+        )
+
+        # Reactive GRASP method
+        grasp_result = evaluate_method(
+            'grasp',
+            'grasp',
+            instance, n_grasp_runs,
+            {**DEFAULT_PARAMETERS['grasp'], 'N': n_grasp_iterations},  # Same runs as the statistics script
+            executor
         )
 
         # Evolutionary 1+1 method
         evo_result = evaluate_method(
             'evolutionary_1_plus_1',
-            evolutionary_one_plus_one,
-            args, n_evolutionary_runs,
-            {'max_iterations': evolutionary_max_iterations}
+            'evolutionary',
+            instance, n_evolutionary_runs,
+            {'max_iterations': evolutionary_max_iterations},
+            executor
         )
 
         # Local Search VNS method
         local_search_result = evaluate_method(
             'local_search_vns',
-            local_search_vns,
-            args, n_evolutionary_runs,
+            'local_search',
+            instance, n_evolutionary_runs,
             {
                 'max_iterations': local_search_max_iterations,
                 'max_no_improve': local_search_max_no_improve,
                 'initial_neighborhood_size': local_search_initial_neighborhood_size,
                 'max_neighborhood_size': local_search_max_neighborhood_size,
                 'num_changes': local_search_num_changes
+            },
+            executor
+        )
+
+        # Tabu search method
+        tabu_search_result = evaluate_method(
+            'tabu_search',
+            'tabu_search',
+            instance, n_tabu_search_runs,
+            {
+                'max_iterations': tabu_search_max_iterations,
+                'max_no_improve': tabu_search_max_no_improve,
+                'tabu_tenure': tabu_search_tabu_tenure
             }
         )
 
-        for res in [det_result, rand_result, evo_result, local_search_result]:
+        # Zone decomposition LNS method
+        lns_result = evaluate_method(
+            'zone_decomposition_lns',
+            'lns',
+            instance, n_lns_runs,
+            {
+                'max_iterations': lns_max_iterations,
+                'max_no_improve': lns_max_no_improve,
+                'max_subproblem_orders': lns_max_subproblem_orders,
+                'subproblem_time_limit': lns_subproblem_time_limit
+            },
+            executor
+        )
+
+        for res in [det_result, lpt_result, differencing_result, rand_result, grasp_result, evo_result, local_search_result, tabu_search_result, lns_result]:
             gap_wmax = compute_gap(res['mean_wmax'], bks['bks_wmax'])
             gap_wmax_wmin = compute_gap(res['mean_wmax_wmin'], bks['bks_wmax_wmin'])
 
@@ -148,6 +196,7 @@ def main():
                 bks['bks_wmax'],
                 bks['bks_wmax_wmin'],
                 res['best_wmax'],
+                res['relinked_wmax'],
                 res['mean_wmax'],
                 gap_wmax,
                 res['best_wmax_wmin'],
@@ -156,6 +205,8 @@ def main():
                 res['time_sec']
             ])
 
+    executor.shutdown()
+
     wb.save('analysis/comparison_table/comparison_table.xlsx')
     print("✅ Comparison report saved to 'analysis/comparison_table/comparison_table.xlsx'")
 
@@ -1,14 +1,13 @@
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 from openpyxl import Workbook
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from shared.data_loader.data_loader import load_data
-from shared.utils import evaluate_solution, verify_solution
-from random_method.heuristics import evolutionary_one_plus_one
+from shared.replicates import combine_replicates, get_replicates
 
 instances_list = [
     '40_homogeneous.xlsx', 
@@ -21,6 +20,7 @@ instances_list = [
 
 n_iterations = 1000  # Internal iterations for each randomized execution
 n_runs = 500          # Total number of randomized executions per instance
+elite_pool_size = 20  # Elite solutions of the runs combined by path relinking
 
 def find_bks():
     wb = Workbook()
@@ -28,27 +28,34 @@ def find_bks():
     ws.title = "bks_results"
     ws.append(['instance', 'bks_wmax', 'wmax_wmin', 'execution_time_sec'])
 
+    executor = ProcessPoolExecutor()
+
     for instance in instances_list:
         print(f"Processing instance: {instance}")
-        P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times = load_data(instance)
 
         best_wmax = float('inf')
         best_gap = float('inf')
         best_time = None
 
-        for run in range(n_runs):
-            start = time.time()
-            assignments, load_zones, exec_time = evolutionary_one_plus_one(
-                P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times, n_iterations
-            )
-            wmax, wmax_wmin = evaluate_solution(load_zones)
-            total_time = time.time() - start
+        # Seeded runs are stored, so they are reused by the comparison table and the statistics
+        runs = get_replicates(instance, 'evolutionary', {'max_iterations': n_iterations}, range(n_runs), executor, keep_solutions=True)
 
+        for run in runs:
+            wmax, wmax_wmin = run['wmax'], run['wmax_wmin']
             if wmax < best_wmax or (wmax == best_wmax and wmax_wmin < best_gap):
-                if verify_solution(assignments, load_zones, P_i, Z_j, S_k):
-                    best_wmax = wmax
-                    best_gap = wmax_wmin
-                    best_time = total_time
+                best_wmax = wmax
+                best_gap = wmax_wmin
+                best_time = run['execution_time']
+
+        # Combine the elite solutions of the runs instead of only keeping the best one
+        relinking_start = time.time()
+        relinked = combine_replicates(instance, runs, elite_pool_size)
+        if relinked.wmax < best_wmax:
+            print(f"Path relinking improved {instance}: {best_wmax} -> {relinked.wmax}")
+            best_wmax = relinked.wmax
+            best_gap = relinked.wmax_wmin
+            # The relinked solution needs every run plus the relinking
+            best_time = sum(run['execution_time'] for run in runs) + time.time() - relinking_start
 
         ws.append([
             instance,
@@ -58,6 +65,8 @@ def find_bks():
         ])
         print(f"✓ BKS found for {instance}: {best_wmax} (gap: {best_gap})\n")
 
+    executor.shutdown()
+
     # Save Excel file
     wb.save('analysis/find_bks/bks_results.xlsx')
     print("✅ Report saved to 'bks_results.xlsx'")
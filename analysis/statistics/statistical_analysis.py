@@ -1,100 +1,190 @@
 import os
 import sys
-import time
-from openpyxl import Workbook
 import statistics
-from scipy.stats import ttest_1samp, shapiro, mannwhitneyu
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import numpy as np
+from openpyxl import Workbook
 
-from shared.data_loader.data_loader import load_data
-from shared.utils import evaluate_solution, verify_solution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
-from random_method.heuristics import evolutionary_one_plus_one
+from shared.replicates import get_replicates
+from ptl.methods import DEFAULT_PARAMETERS, METHODS
 
 instances = [
-    '40_homogeneous.xlsx', 
-    '40_heterogeneous.xlsx', 
+    '40_homogeneous.xlsx',
+    '40_heterogeneous.xlsx',
     '60_homogeneous.xlsx',
     '60_heterogeneous.xlsx',
     '80_homogeneous.xlsx',
     '80_heterogeneous.xlsx',
 ]
 
-n_evolutionary_runs = 30
-evolutionary_max_iterations = 1000
-
-wb = Workbook()
-ws = wb.active
-ws.title = "hypothesis_test"
-ws.append([
-    'instance',
-    'wmax_deterministic',
-    'mean_wmax_evolutionary',
-    'std_wmax_evolutionary',
-    'normality_p',
-    'test_used',
-    'p_value',
-    'result'
-])
-
-for instance in instances:
-    print(f"\n🔎 Processing instance: {instance}")
-    args = load_data(instance)
-
-    # --- Deterministic method ---
-    det_assignments, det_load_zones, _ = nearest_neighbor_minimize_max_workload_time(*args)
-    wmax_det, _ = evaluate_solution(det_load_zones)
-    print(f"Deterministic Wmax: {wmax_det}")
-
-    # --- Evolutionary method (multiple runs) ---
-    wmax_evo_list = []
-    for _ in range(n_evolutionary_runs):
-        assignments, load_zones, _ = evolutionary_one_plus_one(
-            *args, max_iterations=evolutionary_max_iterations
-        )
-        wmax, _ = evaluate_solution(load_zones)
-        if verify_solution(assignments, load_zones, *args[:3]):
-            wmax_evo_list.append(wmax)
-
-    if len(wmax_evo_list) < 3:
-        print("⚠️ Not enough valid evolutionary runs.")
-        continue
-
-    mean_wmax = statistics.mean(wmax_evo_list)
-    std_wmax = statistics.stdev(wmax_evo_list)
+# Every registered method, with the parameters of the comparison table, so its replicates are reused
+methods = list(METHODS)
+deterministic_methods = {'deterministic', 'lpt', 'differencing', 'tabu_search'}  # Same solution for every seed
+
+n_replicates = 30
+n_bootstrap_resamples = 10000
+confidence_level = 0.95
+significance_level = 0.05
+
+output_file = 'analysis/statistics/statistical_analysis.xlsx'
+
+def collect_replicates(instance: str, executor: Optional[ProcessPoolExecutor] = None) -> Dict[str, np.ndarray]:
+    """
+    Wmax of n_replicates seeded runs per method, paired by seed across methods.
+    Deterministic methods are solved once: their Wmax is a single value, a constant and not a sample.
+    """
+    replicates = {}
+    for method_name in methods:
+        seeds = [0] if method_name in deterministic_methods else range(n_replicates)
+        runs = get_replicates(instance, method_name, DEFAULT_PARAMETERS[method_name], seeds, executor)
+        replicates[method_name] = np.array([run['wmax'] for run in runs])
+    return replicates
+
+def bootstrap_ci(values: np.ndarray, rng: np.random.Generator) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean, with all resamples drawn at once.
+    """
+    resample_indices = rng.integers(0, len(values), size=(n_bootstrap_resamples, len(values)))
+    resample_means = values[resample_indices].mean(axis=1)
+    alpha = (1 - confidence_level) / 2
+    low, high = np.quantile(resample_means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+def hypothesis_test(wmax_det: float, wmax_evo: np.ndarray) -> Tuple[float, str, float]:
+    """
+    Tests whether the evolutionary Wmax differs from the deterministic one.
+    Uses a one-sample t-test when the replicates look normal, Mann-Whitney U otherwise.
+    """
+    from scipy.stats import ttest_1samp, shapiro, mannwhitneyu
 
     # Test normality
-    _, normality_p = shapiro(wmax_evo_list)
-    print(f"Shapiro-Wilk p = {normality_p:.4f}")
+    _, normality_p = shapiro(wmax_evo)
 
     # Choose appropriate test
-    if normality_p > 0.05:
-        # Use t-test (one-sample)
-        stat, p_value = ttest_1samp(wmax_evo_list, popmean=wmax_det)
+    if normality_p > significance_level:
+        _, p_value = ttest_1samp(wmax_evo, popmean=wmax_det)
         test_used = 't-test (1-sample)'
     else:
-        # Use Mann-Whitney U (non-parametric)
-        stat, p_value = mannwhitneyu(wmax_evo_list, [wmax_det] * len(wmax_evo_list), alternative='less')
+        _, p_value = mannwhitneyu(wmax_evo, [wmax_det] * len(wmax_evo), alternative='less')
         test_used = 'Mann-Whitney U'
 
-    result = 'reject H0' if p_value < 0.05 else 'fail to reject H0'
-
-    print(f"Method comparison p = {p_value:.4f} → {result}")
-
-    # Write to Excel
+    return float(normality_p), test_used, float(p_value)
+
+def paired_comparisons(replicates: Dict[str, np.ndarray], rng: np.random.Generator) -> List[Tuple[str, str, float, Optional[float], Optional[float], Optional[float], Optional[float]]]:
+    """
+    Compares every pair of methods on their seed-paired replicates.
+    Returns (method_a, method_b, mean difference, CI low, CI high, Wilcoxon p, Holm-adjusted p)
+    where the difference is Wmax(method_a) - Wmax(method_b).
+    - A deterministic method (a single Wmax) is a constant: against a stochastic method, the test
+      is a one-sample Wilcoxon test of the other method's replicates around that constant.
+    - Two deterministic methods only have one observation each: only their difference is
+      reported (CI and p-values are None) and the pair is left out of the Holm family.
+    """
+    from scipy.stats import wilcoxon
+
+    rows = []
+    for method_a, method_b in combinations(replicates, 2):
+        differences = replicates[method_a] - replicates[method_b]  # A single value broadcasts as a constant
+        if len(differences) < 2:
+            rows.append([method_a, method_b, float(differences.mean()), None, None, None])
+            continue
+        ci_low, ci_high = bootstrap_ci(differences, rng)
+        p_value = float(wilcoxon(differences).pvalue) if np.any(differences != 0) else 1.0
+        rows.append([method_a, method_b, float(differences.mean()), ci_low, ci_high, p_value])
+
+    # Holm correction for the family of pairwise tests
+    tested = [index for index, row in enumerate(rows) if row[5] is not None]
+    for row in rows:
+        row.append(None)
+    order = sorted(tested, key=lambda index: rows[index][5])
+    running_max = 0.0
+    for rank, index in enumerate(order):
+        running_max = max(running_max, min(1.0, (len(order) - rank) * rows[index][5]))
+        rows[index][6] = running_max
+
+    return [tuple(row) for row in rows]
+
+def _rounded(value: Optional[float], digits: int) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+def run_analysis(instances: List[str] = instances, jobs: Optional[int] = None, output_file: str = output_file) -> None:
+    """
+    Runs the statistical analysis and saves it to output_file.
+    - hypothesis_test: deterministic vs evolutionary (1+1) Wmax.
+    - bootstrap_ci: mean Wmax of each method with its bootstrap confidence interval.
+    - paired_comparisons: Wilcoxon signed-rank tests between every pair of methods.
+    Missing replicates are generated in a pool of `jobs` processes.
+    """
+    rng = np.random.default_rng(0)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "hypothesis_test"
     ws.append([
-        instance,
-        round(wmax_det, 2),
-        round(mean_wmax, 2),
-        round(std_wmax, 2),
-        round(normality_p, 4),
-        test_used,
-        round(p_value, 4),
-        result
+        'instance',
+        'wmax_deterministic',
+        'mean_wmax_evolutionary',
+        'std_wmax_evolutionary',
+        'normality_p',
+        'test_used',
+        'p_value',
+        'result'
     ])
-
-# Save results
-wb.save("analysis/statistics/statistical_analysis.xlsx")
-print("✅ Results saved to 'analysis/statistics/statistical_analysis.xlsx'")
+    ws_ci = wb.create_sheet('bootstrap_ci')
+    ws_ci.append(['instance', 'method', 'mean_wmax', 'std_wmax', 'ci_low', 'ci_high'])
+    ws_paired = wb.create_sheet('paired_comparisons')
+    ws_paired.append(['instance', 'method_a', 'method_b', 'mean_difference', 'ci_low', 'ci_high', 'p_value', 'p_value_holm', 'result'])
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for instance in instances:
+            print(f"\n🔎 Processing instance: {instance}")
+            replicates = collect_replicates(instance, executor)
+
+            wmax_det = float(replicates['deterministic'][0])
+            wmax_evo = replicates['evolutionary']
+            print(f"Deterministic Wmax: {wmax_det}")
+
+            normality_p, test_used, p_value = hypothesis_test(wmax_det, wmax_evo)
+            result = 'reject H0' if p_value < significance_level else 'fail to reject H0'
+            print(f"Shapiro-Wilk p = {normality_p:.4f}")
+            print(f"Method comparison p = {p_value:.4f} → {result}")
+
+            ws.append([
+                instance,
+                round(wmax_det, 2),
+                round(statistics.mean(wmax_evo), 2),
+                round(statistics.stdev(wmax_evo), 2),
+                round(normality_p, 4),
+                test_used,
+                round(p_value, 4),
+                result
+            ])
+
+            for method_name, wmax_values in replicates.items():
+                if len(wmax_values) < 2:  # Deterministic: a single value, no spread nor interval
+                    ws_ci.append([instance, method_name, round(float(wmax_values[0]), 2), None, None, None])
+                    continue
+                ci_low, ci_high = bootstrap_ci(wmax_values, rng)
+                ws_ci.append([instance, method_name, round(float(wmax_values.mean()), 2), round(float(wmax_values.std(ddof=1)), 2), round(ci_low, 2), round(ci_high, 2)])
+
+            for method_a, method_b, mean_difference, ci_low, ci_high, p_value, p_value_holm in paired_comparisons(replicates, rng):
+                if p_value_holm is None:
+                    result = 'not tested (both deterministic)'
+                else:
+                    result = 'reject H0' if p_value_holm < significance_level else 'fail to reject H0'
+                ws_paired.append([instance, method_a, method_b, round(mean_difference, 2), _rounded(ci_low, 2), _rounded(ci_high, 2), _rounded(p_value, 4), _rounded(p_value_holm, 4), result])
+
+    # Save results
+    wb.save(output_file)
+    print(f"✅ Results saved to '{output_file}'")
+
+def main():
+    run_analysis()
+
+if __name__ == '__main__':
+    main()
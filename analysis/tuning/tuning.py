@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from openpyxl import Workbook
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shared.result_cache import ResultCache
+from ptl.methods import DEFAULT_PARAMETERS
+from ptl.runner import run_job
+
+instances = [
+    '40_homogeneous.xlsx',
+    '40_heterogeneous.xlsx',
+    '60_homogeneous.xlsx',
+    '60_heterogeneous.xlsx',
+    '80_homogeneous.xlsx',
+    '80_heterogeneous.xlsx',
+]
+
+# Candidate values of each parameter; the configurations are their combinations
+tuning_grids = {
+    'evolutionary': {
+        'max_iterations': [500, 1000, 2000, 5000]
+    },
+    'local_search': {
+        'max_iterations': [1000],
+        'max_no_improve': [10, 20, 40],
+        'initial_neighborhood_size': [2, 5],
+        'max_neighborhood_size': [5, 10],
+        'num_changes': [1, 3]
+    },
+}
+
+n_seeds = 10        # Seeds per instance: a size class with two instances races on up to 20 blocks
+min_blocks = 5      # Blocks evaluated by every configuration before the first test
+significance_level = 0.05
+
+output_file = 'analysis/tuning/tuning_results.xlsx'
+
+def build_configurations(method_name: str, grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the grid values, on top of the default parameters of the method.
+    Combinations with an initial neighborhood larger than the maximum one are skipped.
+    """
+    configurations = []
+    for values in product(*grid.values()):
+        configuration = {**DEFAULT_PARAMETERS[method_name], **dict(zip(grid, values))}
+        if configuration.get('initial_neighborhood_size', 0) > configuration.get('max_neighborhood_size', float('inf')):
+            continue
+        configurations.append(configuration)
+    return configurations
+
+def size_classes(instances: List[str]) -> Dict[str, List[str]]:
+    """
+    Instances grouped by their number of orders (name prefix).
+    """
+    classes = {}
+    for instance in instances:
+        classes.setdefault(instance.split('_')[0], []).append(instance)
+    return classes
+
+def race_step(wmax: np.ndarray) -> List[int]:
+    """
+    One elimination step of the race on a blocks x configurations matrix of Wmax.
+    - Friedman test over the configurations (skipped with two configurations).
+    - If it rejects, every configuration whose Wmax is significantly larger than the one of the
+      best ranked configuration (one-sided Wilcoxon signed-rank test) is dropped.
+    Returns the columns to drop.
+    """
+    from scipy.stats import friedmanchisquare, rankdata, wilcoxon
+
+    n_configurations = wmax.shape[1]
+    if np.all(wmax == wmax[:, :1]):
+        return []
+    if n_configurations > 2:
+        _, p_value = friedmanchisquare(*wmax.T)
+        if not p_value < significance_level:
+            return []
+
+    mean_ranks = rankdata(wmax, axis=1).mean(axis=0)
+    best = int(np.argmin(mean_ranks))
+    dropped = []
+    for configuration in range(n_configurations):
+        differences = wmax[:, configuration] - wmax[:, best]
+        if configuration == best or not np.any(differences != 0):
+            continue
+        if wilcoxon(differences, alternative='greater').pvalue < significance_level:
+            dropped.append(configuration)
+    return dropped
+
+def race(
+        method_name: str,
+        configurations: List[Dict[str, Any]],
+        blocks: List[Tuple[str, int]],
+        executor: ProcessPoolExecutor,
+        cache: ResultCache
+    ) -> Tuple[List[int], np.ndarray, np.ndarray, Dict[int, int]]:
+    """
+    F-race of the configurations of a method over (instance, seed) blocks.
+    - The first min_blocks blocks are solved by every configuration, then one block at a time.
+    - The runs of a step are solved in parallel in the executor; seeded runs are reused from the cache.
+    - After each block from min_blocks on, race_step drops the configurations that are significantly worse.
+    Returns (surviving configurations, Wmax and execution time matrices of shape blocks x configurations,
+    number of blocks after which each dropped configuration was eliminated).
+    """
+    alive = list(range(len(configurations)))
+    wmax = np.full((len(blocks), len(configurations)), np.nan)
+    execution_times = np.full((len(blocks), len(configurations)), np.nan)
+    eliminated_after = {}
+
+    n_blocks = 0
+    while n_blocks < len(blocks) and len(alive) > 1:
+        step_blocks = range(n_blocks, max(n_blocks + 1, min(min_blocks, len(blocks))))
+        futures = {
+            (block, configuration): executor.submit(run_job, blocks[block][0], method_name, configurations[configuration], blocks[block][1], None, False, cache)
+            for block in step_blocks for configuration in alive
+        }
+        for (block, configuration), future in futures.items():
+            (_, load_zones, execution_time, _, _), _ = future.result()
+            wmax[block, configuration] = max(load_zones.values())
+            execution_times[block, configuration] = execution_time
+        n_blocks = step_blocks[-1] + 1
+
+        if n_blocks < min_blocks:
+            continue
+        dropped = race_step(wmax[:n_blocks, alive])
+        for column in dropped:
+            eliminated_after[alive[column]] = n_blocks
+        alive = [configuration for column, configuration in enumerate(alive) if column not in dropped]
+
+    return alive, wmax, execution_times, eliminated_after
+
+def run_tuning(
+        tuning_grids: Dict[str, Dict[str, List[Any]]] = tuning_grids,
+        instances: List[str] = instances,
+        jobs: Optional[int] = None,
+        output_file: str = output_file
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Races the configurations of each method on each instance size class and saves the results to output_file.
+    - best_configurations: per size class and method, the cheapest surviving configuration
+      (lowest mean execution time among the configurations with statistically equivalent Wmax).
+    - race: every configuration with its mean Wmax, mean time, mean rank and when it was eliminated.
+    Returns {(size class, method): best configuration}.
+    """
+    from scipy.stats import rankdata
+
+    cache = ResultCache()
+    best_configurations = {}
+
+    wb = Workbook()
+    ws_best = wb.active
+    ws_best.title = 'best_configurations'
+    ws_best.append(['size_class', 'method', 'parameters', 'mean_wmax', 'mean_time_sec', 'blocks', 'survivors'])
+    ws_race = wb.create_sheet('race')
+    ws_race.append(['size_class', 'method', 'parameters', 'blocks_evaluated', 'mean_wmax', 'mean_time_sec', 'mean_rank', 'eliminated_after_blocks'])
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for size_class, class_instances in size_classes(instances).items():
+            blocks = [(instance, seed) for seed in range(n_seeds) for instance in class_instances]
+            for method_name, grid in tuning_grids.items():
+                configurations = build_configurations(method_name, grid)
+                print(f"\n🏁 Racing {len(configurations)} {method_name} configurations on {size_class} orders ({len(blocks)} blocks)")
+                alive, wmax, execution_times, eliminated_after = race(method_name, configurations, blocks, executor, cache)
+
+                n_blocks = int(np.sum(~np.isnan(wmax[:, alive[0]])))
+                mean_wmax = np.nanmean(wmax, axis=0)
+                mean_times = np.nanmean(execution_times, axis=0)
+                best = min(alive, key=lambda configuration: mean_times[configuration])
+                best_configurations[size_class, method_name] = configurations[best]
+                print(f"✓ {len(alive)} survivors after {n_blocks} blocks, best: {configurations[best]} "
+                      f"(Wmax {mean_wmax[best]:.2f}, {mean_times[best]:.4f} s)")
+
+                ws_best.append([size_class, method_name, json.dumps(configurations[best]), round(float(mean_wmax[best]), 2), round(float(mean_times[best]), 4), n_blocks, len(alive)])
+
+                # Ranks over the first min_blocks blocks, the ones every configuration solved
+                first_blocks = wmax[:min(min_blocks, len(blocks))]
+                mean_ranks = rankdata(first_blocks, axis=1).mean(axis=0)
+                for configuration, parameters in enumerate(configurations):
+                    ws_race.append([
+                        size_class,
+                        method_name,
+                        json.dumps(parameters),
+                        int(np.sum(~np.isnan(wmax[:, configuration]))),
+                        round(float(mean_wmax[configuration]), 2),
+                        round(float(mean_times[configuration]), 4),
+                        round(float(mean_ranks[configuration]), 2),
+                        eliminated_after.get(configuration)
+                    ])
+
+    wb.save(output_file)
+    print(f"✅ Results saved to '{output_file}'")
+    return best_configurations
+
+def main():
+    run_tuning()
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,13 @@
 import time
+import heapq
 import random
-from typing import Dict, Tuple, List
+from itertools import count
+import numpy as np
+from typing import Callable, Dict, Tuple, List, Optional, Union
 
-from shared.utils import evaluate_solution
+from shared.utils import DEBUG_VERIFY, evaluate_solution, sku_count, verify_solution
+from shared.search_stats import SearchStats
+from shared.solution import FREE_EXIT, Solution, bottleneck_descent, instance_arrays
 
 def nearest_neighbor_minimize_max_workload_time(
         P_i: List[str], 
@@ -34,7 +39,7 @@ def nearest_neighbor_minimize_max_workload_time(
     remaining_exits = S_k.copy()  # Exits to be assigned
     
     # Sort orders by the number of SKUs in descending order (highest first)
-    sorted_orders = sorted(P_i, key=lambda order: sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1), reverse=True)
+    sorted_orders = sorted(P_i, key=lambda order: sku_count(order, R_m, rp_im), reverse=True)
     
     for order in sorted_orders:
         available_zones = [z for z in Z_j if any(s_jk.get((z, k), 0) == 1 and k in remaining_exits for k in S_k)]
@@ -52,7 +57,7 @@ def nearest_neighbor_minimize_max_workload_time(
         remaining_exits.remove(selected_exit)  # Mark exit as assigned
         
         # Calculate classification time
-        num_skus = sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1)
+        num_skus = sku_count(order, R_m, rp_im)
         classification_time = classification_times[order]
         classification_time += num_skus * 2 * (d_jk[selected_zone, selected_exit] / v)  # Apply travel time per SKU
         
@@ -74,7 +79,8 @@ def nearest_neighbor_minimize_max_workload_time_randomized(
         rp_im: Dict[Tuple[str, str], int], 
         d_jk: Dict[Tuple[str, str], float], 
         classification_times: Dict[str, float],
-        N: int
+        N: int,
+        should_stop: Optional[Callable[[float], bool]] = None
     ) -> Tuple[
             Dict[str, Tuple[str, str, float]], 
             Dict[str, float],
@@ -87,6 +93,8 @@ def nearest_neighbor_minimize_max_workload_time_randomized(
     - Uses the nearest neighbor rule for exit selection.
     - Ensures that all orders are assigned to an exit without skipping any.
     - Iterates N times to find the best solution.
+    - With should_stop, should_stop(best Wmax) is called once per construction and the best solution
+      found so far is returned as soon as it returns True (e.g. at a deadline).
     """
 
     start_time = time.time()
@@ -97,6 +105,9 @@ def nearest_neighbor_minimize_max_workload_time_randomized(
     best_wmax_wmin = float('inf')
 
     for _ in range(N):
+        if should_stop is not None and best_assignments is not None and should_stop(best_wmax):
+            break
+
         assignments = {}
         load_zones = {zone: 0 for zone in Z_j}  # Initialize load per zone
         remaining_exits = S_k.copy()  # Exits to be assigned
@@ -120,7 +131,7 @@ def nearest_neighbor_minimize_max_workload_time_randomized(
             remaining_exits.remove(selected_exit)  # Mark exit as assigned
             
             # Calculate classification time
-            num_skus = sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1)
+            num_skus = sku_count(order, R_m, rp_im)
             classification_time = classification_times[order]
             classification_time += num_skus * 2 * (d_jk[selected_zone, selected_exit] / v)  # Apply travel time per SKU
             
@@ -139,4 +150,389 @@ def nearest_neighbor_minimize_max_workload_time_randomized(
     
     execution_time = time.time() - start_time
 
-    return best_assignments, best_load_zones, execution_time
\ No newline at end of file
+    return best_assignments, best_load_zones, execution_time
+
+def estimated_order_times(num_skus: np.ndarray, times: np.ndarray, travel: np.ndarray) -> np.ndarray:
+    """
+    Processing time of each order before its exit is known: classification time plus the
+    travel of its SKUs to an exit at the mean distance.
+    """
+    return times + num_skus * travel[np.isfinite(travel)].mean()
+
+def zones_to_solution(
+        zone_orders: List[List[int]],
+        num_skus: np.ndarray,
+        times: np.ndarray,
+        travel: np.ndarray,
+        exit_zone: np.ndarray,
+        zone_exits: List[np.ndarray],
+        P_i: Tuple[str, ...],
+        Z_j: Tuple[str, ...],
+        S_k: Tuple[str, ...]
+    ) -> Solution:
+    """
+    Solution with the orders of each zone at its exits: the orders with the most SKUs take the
+    nearest exits, which minimizes the travel time of the zone for a given set of orders.
+    """
+    n_orders = len(num_skus)
+    order_exit = np.empty(n_orders, dtype=np.int32)
+    exit_order = np.full(len(S_k), FREE_EXIT, dtype=np.int32)
+    zone_load = np.zeros(len(Z_j), dtype=np.float64)
+
+    for zone, orders in enumerate(zone_orders):
+        if len(orders) > len(zone_exits[zone]):
+            raise ValueError(f"Zone '{Z_j[zone]}' received {len(orders)} orders for {len(zone_exits[zone])} exits.")
+        orders = sorted(orders, key=lambda order: -num_skus[order])
+        order_exit[orders] = zone_exits[zone][:len(orders)]
+        exit_order[zone_exits[zone][:len(orders)]] = orders
+
+    order_cost = times + num_skus * travel[order_exit]
+    np.add.at(zone_load, exit_zone[order_exit], order_cost)
+    return Solution(P_i, Z_j, S_k, exit_zone, order_exit, exit_order, order_cost, zone_load)
+
+def longest_processing_time(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float]
+    ) -> Tuple[
+            Dict[str, Tuple[str, str, float]],
+            Dict[str, float],
+            float
+        ]:
+    """
+    Longest Processing Time (LPT) rule for the min-max zone load:
+    - Orders are sorted by estimated processing time (see estimated_order_times) in descending
+      order; ties go to the order with the most SKUs, whose travel time depends most on its exit.
+    - Each order goes to the zone with the least projected workload, at its nearest free exit.
+      The projected workload adds the mean estimated time of the remaining orders for every other
+      free exit of the zone, so zones with fewer exits take larger orders and all zones fill up
+      evenly. Zone loads are kept in one heap per number of free exits; ties go to the zone with
+      the nearest free exit.
+    - Finally, the orders with the most SKUs of each zone take its nearest exits.
+    """
+    start_time = time.time()
+
+    P_i, Z_j, S_k = tuple(P_i), tuple(Z_j), tuple(S_k)
+    num_skus, times, travel, exit_zone, zone_exits = instance_arrays(P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+    estimated_times = estimated_order_times(num_skus, times, travel)
+    sorted_orders = sorted(range(len(P_i)), key=lambda order: (-estimated_times[order], -num_skus[order]))
+
+    # Zones with free exits, in one heap of (load, travel of the nearest free exit, zone) per number of free exits
+    zone_orders = [[] for _ in Z_j]
+    heaps = {}
+    for zone, exits in enumerate(zone_exits):
+        if len(exits):
+            heaps.setdefault(len(exits), []).append((0.0, float(travel[exits[0]]), zone))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+    remaining_time = float(estimated_times.sum())
+
+    for position, order in enumerate(sorted_orders):
+        if not heaps:
+            raise ValueError("No available zones for assignment. Check instance constraints.")
+        # Projected load: load plus the mean estimated time of the remaining orders for every other free exit
+        mean_time = remaining_time / (len(sorted_orders) - position)
+        free_exits = min(heaps, key=lambda free: (heaps[free][0][0] + (free - 1) * mean_time, *heaps[free][0][1:]))
+        load, nearest_travel, zone = heapq.heappop(heaps[free_exits])
+        if not heaps[free_exits]:
+            del heaps[free_exits]
+        remaining_time -= estimated_times[order]
+
+        zone_orders[zone].append(order)
+        load += times[order] + num_skus[order] * nearest_travel
+        if free_exits > 1:
+            heapq.heappush(heaps.setdefault(free_exits - 1, []), (load, float(travel[zone_exits[zone][len(zone_orders[zone])]]), zone))
+
+    best_assignments, best_load_zones = zones_to_solution(zone_orders, num_skus, times, travel, exit_zone, zone_exits, P_i, Z_j, S_k).to_assignments()
+
+    execution_time = time.time() - start_time
+
+    return best_assignments, best_load_zones, execution_time
+
+def differencing_partition(estimated_times: np.ndarray, n_subsets: int) -> List[List[int]]:
+    """
+    Multiway Karmarkar-Karp largest differencing method.
+    - Every order starts as a partial partition with the order in one subset and the other subsets empty.
+    - The two partial partitions with the largest difference between their heaviest and lightest
+      subsets are merged, joining the heaviest subset of one with the lightest of the other, and so
+      on, until a single partition is left. Partial partitions are kept in a heap by difference.
+    Returns the orders of each subset, from the heaviest to the lightest subset.
+    """
+    tie_breaker = count()
+    heap = []
+    for order in np.argsort(-estimated_times, kind='stable').tolist():
+        loads = [float(estimated_times[order])] + [0.0] * (n_subsets - 1)
+        subsets = [[order]] + [[] for _ in range(n_subsets - 1)]
+        heap.append((loads[-1] - loads[0], next(tie_breaker), loads, subsets))
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        _, _, loads_a, subsets_a = heapq.heappop(heap)
+        _, _, loads_b, subsets_b = heapq.heappop(heap)
+        merged = sorted(
+            ((loads_a[i] + loads_b[-1 - i], subsets_a[i] + subsets_b[-1 - i]) for i in range(n_subsets)),
+            key=lambda subset: -subset[0]
+        )
+        loads = [load for load, _ in merged]
+        heapq.heappush(heap, (loads[-1] - loads[0], next(tie_breaker), loads, [orders for _, orders in merged]))
+
+    return heap[0][3] if heap else [[] for _ in range(n_subsets)]
+
+def _best_swap(zone_orders: List[List[int]], zone_times: np.ndarray, loads: List[float], zone_a: int, zone_b: int) -> Tuple[float, Tuple[int, int], float, float]:
+    """
+    Swap of an order of zone_a with an order of zone_b with the lowest larger load of the two zones.
+    Returns (larger load, (position in zone_a, position in zone_b), new load of zone_a, new load of zone_b).
+    """
+    orders_a, orders_b = np.array(zone_orders[zone_a]), np.array(zone_orders[zone_b])
+    if not orders_a.size or not orders_b.size:
+        return float('inf'), (0, 0), loads[zone_a], loads[zone_b]
+    loads_a = loads[zone_a] - zone_times[orders_a, zone_a][:, None] + zone_times[orders_b, zone_a][None, :]
+    loads_b = loads[zone_b] - zone_times[orders_b, zone_b][None, :] + zone_times[orders_a, zone_b][:, None]
+    new_max = np.maximum(loads_a, loads_b)
+    swap = np.unravel_index(np.argmin(new_max), new_max.shape)
+    return float(new_max[swap]), (int(swap[0]), int(swap[1])), float(loads_a[swap]), float(loads_b[swap])
+
+def _apply_swap(zone_orders: List[List[int]], loads: List[float], zone_a: int, zone_b: int, swap: Tuple[int, int], load_a: float, load_b: float) -> None:
+    position_a, position_b = swap
+    zone_orders[zone_a][position_a], zone_orders[zone_b][position_b] = zone_orders[zone_b][position_b], zone_orders[zone_a][position_a]
+    loads[zone_a], loads[zone_b] = load_a, load_b
+
+def repair_zone_capacities(zone_orders: List[List[int]], zone_times: np.ndarray, capacities: List[int]) -> None:
+    """
+    Makes a partition of the orders fit the exits of each zone, in place.
+    - zone_times[i, j]: estimated processing time of order i in zone j.
+    - Each move takes the order of the zone with the most excess orders to the least loaded zone
+      with free exits that leaves the larger of the two loads lowest, followed by the best swaps
+      between the two zones while they lower the larger of the two loads.
+    - Finally, the best swaps between the most loaded zone and any other zone are applied while
+      they lower the largest load, since the estimated times differ from zone to zone.
+    """
+    loads = [float(zone_times[orders, zone].sum()) for zone, orders in enumerate(zone_orders)]
+    while True:
+        over = [zone for zone, orders in enumerate(zone_orders) if len(orders) > capacities[zone]]
+        if not over:
+            break
+        free = [zone for zone, orders in enumerate(zone_orders) if len(orders) < capacities[zone]]
+        if not free:
+            raise ValueError("There are more orders than exits. Check instance constraints.")
+        source = max(over, key=lambda zone: len(zone_orders[zone]) - capacities[zone])
+        target = min(free, key=lambda zone: loads[zone])
+        order = min(zone_orders[source], key=lambda order: max(loads[source] - zone_times[order, source], loads[target] + zone_times[order, target]))
+        zone_orders[source].remove(order)
+        zone_orders[target].append(order)
+        loads[source] -= zone_times[order, source]
+        loads[target] += zone_times[order, target]
+
+        while True:
+            new_max, swap, load_source, load_target = _best_swap(zone_orders, zone_times, loads, source, target)
+            if new_max >= max(loads[source], loads[target]) - 1e-9:
+                break
+            _apply_swap(zone_orders, loads, source, target, swap, load_source, load_target)
+
+    while True:
+        bottleneck = int(np.argmax(loads))
+        moves = [(*_best_swap(zone_orders, zone_times, loads, bottleneck, zone), zone) for zone in range(len(loads)) if zone != bottleneck]
+        if not moves:
+            return
+        new_max, swap, load_bottleneck, load_zone, zone = min(moves)
+        if new_max >= loads[bottleneck] - 1e-9:
+            return
+        _apply_swap(zone_orders, loads, bottleneck, zone, swap, load_bottleneck, load_zone)
+
+def largest_differencing(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float]
+    ) -> Tuple[
+            Dict[str, Tuple[str, str, float]],
+            Dict[str, float],
+            float
+        ]:
+    """
+    Karmarkar-Karp differencing constructive for the min-max zone load:
+    - The orders are split into one subset per zone with differencing_partition on their
+      estimated processing times (see estimated_order_times).
+    - The subsets with the most orders go to the zones with the most exits, and the orders
+      that do not fit are moved with repair_zone_capacities.
+    - Finally, the orders with the most SKUs of each zone take its nearest exits.
+    """
+    start_time = time.time()
+
+    P_i, Z_j, S_k = tuple(P_i), tuple(Z_j), tuple(S_k)
+    num_skus, times, travel, exit_zone, zone_exits = instance_arrays(P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+    estimated_times = estimated_order_times(num_skus, times, travel)
+    capacities = [len(exits) for exits in zone_exits]
+    zone_times = times[:, None] + num_skus[:, None] * np.array([travel[exits].mean() for exits in zone_exits])[None, :]
+
+    subsets = sorted(differencing_partition(estimated_times, len(Z_j)), key=len, reverse=True)
+    zone_orders = [[] for _ in Z_j]
+    for zone, orders in zip(sorted(range(len(Z_j)), key=lambda zone: -capacities[zone]), subsets):
+        zone_orders[zone] = orders
+    repair_zone_capacities(zone_orders, zone_times, capacities)
+
+    best_assignments, best_load_zones = zones_to_solution(zone_orders, num_skus, times, travel, exit_zone, zone_exits, P_i, Z_j, S_k).to_assignments()
+
+    execution_time = time.time() - start_time
+
+    return best_assignments, best_load_zones, execution_time
+
+def grasp_construct(
+        num_skus: np.ndarray,
+        times: np.ndarray,
+        zone_exits: List[np.ndarray],
+        travel: np.ndarray,
+        exit_zone: np.ndarray,
+        P_i: Tuple[str, ...],
+        Z_j: Tuple[str, ...],
+        S_k: Tuple[str, ...],
+        alpha: float
+    ) -> Solution:
+    """
+    Greedy randomized construction of the GRASP.
+    - Order RCL: remaining orders with a SKU count of at least max - alpha * (max - min).
+    - Zone RCL: zones with free exits whose load after receiving the order (at their nearest
+      free exit) is at most min + alpha * (max - min).
+    - The order takes the nearest free exit of the chosen zone.
+    With alpha = 0 it is the greedy construction, with alpha = 1 it is fully random.
+    """
+    n_orders = len(num_skus)
+    order_exit = np.empty(n_orders, dtype=np.int32)
+    exit_order = np.full(len(S_k), FREE_EXIT, dtype=np.int32)
+    order_cost = np.empty(n_orders, dtype=np.float64)
+    zone_load = np.zeros(len(Z_j), dtype=np.float64)
+    next_exit = np.zeros(len(Z_j), dtype=np.int64)  # Position of the nearest free exit in zone_exits
+    zone_size = np.array([len(exits) for exits in zone_exits])
+    remaining = list(range(n_orders))
+
+    for _ in range(n_orders):
+        remaining_skus = num_skus[remaining]
+        threshold = remaining_skus.max() - alpha * (remaining_skus.max() - remaining_skus.min())
+        candidates = [order for order, skus in zip(remaining, remaining_skus) if skus >= threshold]
+        order = random.choice(candidates)
+        remaining.remove(order)
+
+        open_zones = np.flatnonzero(next_exit < zone_size)
+        if open_zones.size == 0:
+            raise ValueError("No available zones for assignment. Check instance constraints.")
+        nearest_exits = np.array([zone_exits[zone][next_exit[zone]] for zone in open_zones])
+        costs = times[order] + num_skus[order] * travel[nearest_exits]
+        new_loads = zone_load[open_zones] + costs
+        threshold = new_loads.min() + alpha * (new_loads.max() - new_loads.min())
+        choice = random.choice(np.flatnonzero(new_loads <= threshold).tolist())
+
+        zone, exit_ = open_zones[choice], nearest_exits[choice]
+        next_exit[zone] += 1
+        order_exit[order] = exit_
+        exit_order[exit_] = order
+        order_cost[order] = costs[choice]
+        zone_load[zone] += costs[choice]
+
+    return Solution(P_i, Z_j, S_k, exit_zone, order_exit, exit_order, order_cost, zone_load)
+
+def grasp(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float],
+        N: int = 100,
+        alphas: Tuple[float, ...] = (0.0, 0.1, 0.2, 0.3, 0.5),
+        local_search_moves: int = 20,
+        reactive_interval: int = 10,
+        should_stop: Optional[Callable[[float], bool]] = None,
+        collect_stats: bool = False
+    ) -> Union[
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float],
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, SearchStats]
+        ]:
+    """
+    Reactive GRASP:
+    - Builds N solutions with grasp_construct, whose SKU counts, classification times and
+      nearest exit lists are computed once.
+    - After each construction, applies up to local_search_moves best improving moves or swaps
+      of an order of the bottleneck zone (0 disables the local improvement).
+    - Reactive alpha: each construction draws alpha from alphas; every reactive_interval
+      constructions the probabilities are set proportional to (best Wmax / mean Wmax of alpha) ** 10.
+    - With should_stop, should_stop(best Wmax) is called once per construction and the best solution
+      found so far is returned as soon as it returns True (e.g. at a deadline).
+    - With collect_stats=True, a SearchStats object is returned after the execution time.
+    """
+    if N < 1:
+        raise ValueError(f"GRASP needs at least one construction (N >= 1), got N={N}.")
+
+    start_time = time.time()
+
+    P_i, Z_j, S_k = tuple(P_i), tuple(Z_j), tuple(S_k)
+    num_skus, times, travel, exit_zone, zone_exits = instance_arrays(P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+
+    probabilities = np.full(len(alphas), 1 / len(alphas))
+    alpha_wmax_sum = np.zeros(len(alphas))
+    alpha_uses = np.zeros(len(alphas))
+
+    best = None
+    best_wmax = float('inf')
+    stats = SearchStats() if collect_stats else None
+    evaluations = 0
+    moves_proposed = 0
+    moves_accepted = 0
+
+    for iteration in range(1, N + 1):
+        if should_stop is not None and best is not None and should_stop(best_wmax):
+            break
+
+        alpha_index = random.choices(range(len(alphas)), weights=probabilities)[0]
+        solution = grasp_construct(num_skus, times, zone_exits, travel, exit_zone, P_i, Z_j, S_k, alphas[alpha_index])
+        evaluations += 1
+
+        # Short best improvement descent on the bottleneck zone
+        descent_evaluations, descent_moves = bottleneck_descent(solution, travel, times, num_skus, local_search_moves)
+        evaluations += descent_evaluations
+        moves_proposed += descent_evaluations
+        moves_accepted += descent_moves
+
+        wmax = solution.wmax
+        alpha_wmax_sum[alpha_index] += wmax
+        alpha_uses[alpha_index] += 1
+        if wmax < best_wmax:
+            best = solution
+            best_wmax = wmax
+            if DEBUG_VERIFY:
+                verify_solution(*best.to_assignments(), list(P_i), list(Z_j), list(S_k), R_m, v, s_jk, rp_im, d_jk, classification_times)
+            if stats is not None:
+                stats.trajectory.append((time.time() - start_time, best_wmax))
+
+        if iteration % reactive_interval == 0:
+            mean_wmax = np.where(alpha_uses > 0, alpha_wmax_sum / np.maximum(alpha_uses, 1), best_wmax)
+            quality = (best_wmax / mean_wmax) ** 10
+            probabilities = quality / quality.sum()
+
+    best_assignments, best_load_zones = best.to_assignments()
+
+    execution_time = time.time() - start_time
+
+    if stats is None:
+        return best_assignments, best_load_zones, execution_time
+
+    stats.moves_proposed = moves_proposed  # Moves evaluated and applied by the descents
+    stats.moves_accepted = moves_accepted
+    stats.evaluations = evaluations
+    stats.initial_phase_time = 0.0
+    stats.improvement_phase_time = execution_time
+
+    return best_assignments, best_load_zones, execution_time, stats
@@ -0,0 +1,230 @@
+import time
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Tuple, List, Optional, Union
+
+from shared.utils import DEBUG_VERIFY, verify_solution
+from shared.search_stats import SearchStats
+from shared.solution import Solution, instance_arrays
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+
+def repair_subproblem(
+        costs: np.ndarray,
+        exit_group_zone: np.ndarray,
+        fixed_loads: np.ndarray,
+        time_limit: float
+    ) -> Optional[np.ndarray]:
+    """
+    Exact repair of a destroyed sub-problem with a MILP (HiGHS through scipy):
+    assign each freed order to one freed exit, minimizing the largest load of the freed zones.
+    - costs[o, e]: classification time of freed order o at freed exit e.
+    - exit_group_zone[e]: index of the zone of freed exit e among the freed zones.
+    - fixed_loads[z]: load of the orders of freed zone z that were not freed.
+    Returns the freed exit of each freed order, or None if no solution is found within time_limit.
+    """
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    from scipy.sparse import coo_matrix, vstack
+
+    # Exits of the same zone with the same costs (same travel time) are interchangeable:
+    # merge them into one exit class whose capacity is the number of exits, which removes
+    # the symmetric solutions the branch and bound would otherwise explore
+    exit_keys = np.column_stack([exit_group_zone, np.round(costs.T, 9)])
+    _, class_first_exit, exit_class, class_size = np.unique(exit_keys, axis=0, return_index=True, return_inverse=True, return_counts=True)
+    exit_class = exit_class.ravel()
+    class_costs = costs[:, class_first_exit]
+    class_zone = exit_group_zone[class_first_exit]
+
+    n_orders, n_classes = class_costs.shape
+    n_zones = len(fixed_loads)
+    n_variables = n_orders * n_classes + 1  # x[o, c] flattened, then W
+    order_of_variable = np.repeat(np.arange(n_orders), n_classes)
+    class_of_variable = np.tile(np.arange(n_classes), n_orders)
+    variables = np.arange(n_orders * n_classes)
+
+    # Each order gets exactly one exit, each exit class holds at most its number of exits
+    assign_rows = coo_matrix((np.ones(n_orders * n_classes), (order_of_variable, variables)), shape=(n_orders, n_variables))
+    capacity_rows = coo_matrix((np.ones(n_orders * n_classes), (class_of_variable, variables)), shape=(n_classes, n_variables))
+    # fixed_load[z] + sum of the costs assigned to zone z <= W
+    zone_rows = coo_matrix((
+        np.concatenate([class_costs.ravel(), -np.ones(n_zones)]),
+        (np.concatenate([class_zone[class_of_variable], np.arange(n_zones)]), np.concatenate([variables, np.full(n_zones, n_variables - 1)]))
+    ), shape=(n_zones, n_variables))
+
+    constraints = LinearConstraint(
+        vstack([assign_rows, capacity_rows, zone_rows]).tocsr(),
+        np.concatenate([np.ones(n_orders), np.zeros(n_classes), np.full(n_zones, -np.inf)]),
+        np.concatenate([np.ones(n_orders), class_size, -fixed_loads])
+    )
+
+    objective = np.concatenate([np.zeros(n_orders * n_classes), [1.0]])
+    integrality = np.concatenate([np.ones(n_orders * n_classes), [0]])
+    bounds = Bounds(np.zeros(n_variables), np.concatenate([np.ones(n_orders * n_classes), [np.inf]]))
+
+    result = milp(objective, constraints=constraints, integrality=integrality, bounds=bounds, options={'time_limit': time_limit})
+    if result.x is None:
+        return None
+
+    # Hand out the exits of each class to the orders assigned to it
+    order_class = np.argmax(result.x[:-1].reshape(n_orders, n_classes), axis=1)
+    class_exits = [list(np.flatnonzero(exit_class == c)) for c in range(n_classes)]
+    return np.array([class_exits[c].pop() for c in order_class])
+
+def zone_decomposition_lns(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float],
+        max_iterations: int = 100,
+        max_no_improve: int = 10,
+        initial_destroy_zones: int = 1,
+        max_destroy_zones: int = 2,
+        max_subproblem_orders: int = 24,
+        subproblem_time_limit: float = 0.5,
+        workers: int = 1,
+        should_stop: Optional[Callable[[float], bool]] = None,
+        collect_stats: bool = False
+    ) -> Union[
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float],
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, SearchStats]
+        ]:
+    """
+    Large neighborhood search decomposed by zones:
+    - Starts with the deterministic nearest neighbor solution.
+    - Destroy: frees the orders of the heaviest zone plus a number of light zones that starts at
+      initial_destroy_zones and grows up to max_destroy_zones (at most max_subproblem_orders orders, picked at random when the zones hold more, so a
+      sub-problem stays a small part of the instance whatever its size).
+    - Repair: reassigns the freed orders to the freed exits exactly with a small MILP.
+    - The zones left out of a group form further disjoint groups (heaviest remaining
+      zone plus light zones), whose sub-problems are solved in `workers` processes.
+    - Like local_search_vns, it keeps the incumbent, grows the number of light zones by one after
+      an iteration without improvement and resets it to initial_destroy_zones after an improvement.
+    - Stops after max_iterations or if no improvement occurs for max_no_improve iterations.
+    - With should_stop, should_stop(best Wmax) is called once per iteration and, with one worker,
+      before each repair; the best solution found so far is returned as soon as it returns True
+      (e.g. at a deadline), keeping the repairs already solved.
+    - With collect_stats=True, a SearchStats object is returned after the execution time.
+    """
+    start_time = time.time()
+
+    initial_assignments, initial_load_zones, _ = nearest_neighbor_minimize_max_workload_time(
+        P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
+    )
+
+    num_skus, times, travel, exit_zone, _ = instance_arrays(P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+    best = Solution.from_assignments(initial_assignments, initial_load_zones, P_i, Z_j, S_k, exit_zone)
+    best_wmax = best.wmax
+
+    stats = SearchStats() if collect_stats else None
+    initial_phase_end = time.time()
+    if stats is not None:
+        stats.trajectory.append((initial_phase_end - start_time, best_wmax))
+    moves_proposed = 0
+    moves_accepted = 0
+
+    no_improve_count = 0
+    destroy_zones = initial_destroy_zones
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        for _ in range(max_iterations):
+            if no_improve_count >= max_no_improve:
+                break
+            if should_stop is not None and should_stop(best_wmax):
+                break
+
+            # Split the zones into disjoint groups: heaviest remaining zone plus random light zones
+            remaining_zones = list(np.argsort(-best.zone_load))
+            groups = []
+            while len(remaining_zones) > 1:
+                heavy_zone = remaining_zones.pop(0)
+                light_candidates = remaining_zones[-2 * destroy_zones:]
+                light_zones = random.sample(light_candidates, min(destroy_zones, len(light_candidates)))
+                for zone in light_zones:
+                    remaining_zones.remove(zone)
+                groups.append([heavy_zone] + light_zones)
+
+            subproblems = []
+            for group in groups:
+                group_exits = np.flatnonzero(np.isin(exit_zone, group))
+                group_orders = best.exit_order[group_exits]
+                group_orders = group_orders[group_orders >= 0]
+                if len(group_orders) > max_subproblem_orders:
+                    group_orders = np.array(random.sample(list(group_orders), max_subproblem_orders))
+                # Freed exits: the exits of the freed orders plus the unused exits of the group
+                freed_exits = np.concatenate([best.order_exit[group_orders], group_exits[best.exit_order[group_exits] < 0]])
+
+                group_index = {zone: z for z, zone in enumerate(group)}
+                exit_group_zone = np.array([group_index[zone] for zone in exit_zone[freed_exits]])
+                freed_loads = np.bincount(exit_zone[best.order_exit[group_orders]], weights=best.order_cost[group_orders], minlength=len(Z_j))
+                fixed_loads = best.zone_load[group] - freed_loads[group]
+                costs = times[group_orders][:, None] + num_skus[group_orders][:, None] * travel[freed_exits][None, :]
+                subproblems.append((group, group_orders, freed_exits, (costs, exit_group_zone, fixed_loads, subproblem_time_limit)))
+
+            if executor is not None:
+                repairs = list(executor.map(repair_subproblem, *zip(*[subproblem[3] for subproblem in subproblems])))
+            else:
+                repairs = []
+                for subproblem in subproblems:
+                    if should_stop is not None and should_stop(best_wmax):
+                        break
+                    repairs.append(repair_subproblem(*subproblem[3]))
+            moves_proposed += len(repairs)
+
+            # Apply each repaired group that does not worsen its largest load
+            candidate = best.copy()
+            for (group, group_orders, freed_exits, (costs, _, _, _)), repair in zip(subproblems, repairs):
+                if repair is None:
+                    continue
+                new_exits = freed_exits[repair]
+                new_costs = costs[np.arange(len(group_orders)), repair]
+                old_group_load = candidate.zone_load[group].copy()
+                new_group_load = old_group_load - np.bincount(exit_zone[candidate.order_exit[group_orders]], weights=candidate.order_cost[group_orders], minlength=len(Z_j))[group] \
+                    + np.bincount(exit_zone[new_exits], weights=new_costs, minlength=len(Z_j))[group]
+                if new_group_load.max() > old_group_load.max():
+                    continue
+                candidate.exit_order[freed_exits] = -1
+                candidate.exit_order[new_exits] = group_orders
+                candidate.order_exit[group_orders] = new_exits
+                candidate.order_cost[group_orders] = new_costs
+                candidate.zone_load[group] = new_group_load
+
+            candidate_wmax = candidate.wmax
+            if candidate_wmax < best_wmax - 1e-9:
+                best = candidate
+                best_wmax = candidate_wmax
+                no_improve_count = 0
+                destroy_zones = initial_destroy_zones
+                moves_accepted += 1
+                if DEBUG_VERIFY:
+                    verify_solution(*best.to_assignments(), P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+                if stats is not None:
+                    stats.trajectory.append((time.time() - start_time, best_wmax))
+            else:
+                # Keep balancing moves that do not change Wmax, so the next destroy step sees a new state
+                best = candidate
+                no_improve_count += 1
+                destroy_zones = min(destroy_zones + 1, max_destroy_zones)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    best_assignments, best_load_zones = best.to_assignments()
+
+    execution_time = time.time() - start_time
+
+    if stats is None:
+        return best_assignments, best_load_zones, execution_time
+
+    stats.moves_proposed = moves_proposed
+    stats.moves_accepted = moves_accepted
+    stats.evaluations = moves_proposed
+    stats.initial_phase_time = initial_phase_end - start_time
+    stats.improvement_phase_time = execution_time - stats.initial_phase_time
+
+    return best_assignments, best_load_zones, execution_time, stats
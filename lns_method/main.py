@@ -0,0 +1,12 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ptl.cli import main as ptl_main
+
+def main():
+    # Equivalent to: python -m ptl -m deterministic lns --report lns
+    ptl_main(['-m', 'deterministic', 'lns', '--report', 'lns'] + sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
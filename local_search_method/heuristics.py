@@ -1,8 +1,10 @@
 import time
 import random
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List, Optional, Union
 
-from shared.utils import evaluate_solution
+from shared.utils import DEBUG_VERIFY, evaluate_solution, sku_count, verify_solution
+from shared.search_stats import SearchStats
+from shared.checkpoint import Checkpointer
 from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time_randomized
 
 def generate_aggressive_neighbor(
@@ -42,7 +44,7 @@ def generate_aggressive_neighbor(
     # Recalculate classification times for the affected orders
     for order in orders_to_change:
         zone, new_exit, _ = mutated_assignments[order]
-        num_skus = sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1)
+        num_skus = sku_count(order, R_m, rp_im)
         new_classification_time = classification_times[order]
         new_classification_time += num_skus * 2 * (d_jk[zone, new_exit] / v)  # Travel time per SKU
         mutated_assignments[order] = (zone, new_exit, new_classification_time)
@@ -66,11 +68,14 @@ def local_search_vns(
         max_no_improve: int = 10,
         initial_neighborhood_size: int = 5,
         max_neighborhood_size: int = 10,
-        num_changes: int = 3
-    ) -> Tuple[
-            Dict[str, Tuple[str, str, float]], 
-            Dict[str, float],
-            float
+        num_changes: int = 3,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+        should_stop: Optional[Callable[[float], bool]] = None,
+        collect_stats: bool = False
+    ) -> Union[
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float],
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, SearchStats]
         ]:
     """
     Improved VNS with hierarchical neighborhoods and adaptive parameters:
@@ -78,29 +83,97 @@ def local_search_vns(
     - Dynamically adjusts neighborhood size and explores hierarchical neighborhoods.
     - Selects the best solution in the neighborhood (best improvement).
     - Stops after max_iterations or if no improvement occurs for max_no_improve iterations.
+    - With collect_stats=True, a SearchStats object is returned after the execution time.
+    - With checkpoint_path, the state of the search (incumbent, current solution, order of P_i,
+      RNG state, counters, neighborhood size) is saved after the initial solution and then every
+      checkpoint_interval seconds; a run finding a checkpoint there resumes it exactly.
+      The checkpoint is removed when the run finishes.
+    - With should_stop, should_stop(best Wmax) is called once per iteration and the best solution
+      found so far is returned as soon as it returns True (e.g. at a deadline).
     """
     start_time = time.time()
 
-    # Generate initial solution using randomized nearest neighbor heuristic
-    current_assignments, current_load_zones, _ = nearest_neighbor_minimize_max_workload_time_randomized(
-        P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times, 1000
-    )
-    best_assignments = current_assignments
-    best_load_zones = current_load_zones
-    best_wmax, _ = evaluate_solution(best_load_zones)
-
-    no_improve_count = 0
-    neighborhood_size = initial_neighborhood_size
-
-    for _ in range(max_iterations):
+    checkpointer = None
+    state = None
+    if checkpoint_path:
+        parameters = {
+            'max_iterations': max_iterations,
+            'max_no_improve': max_no_improve,
+            'initial_neighborhood_size': initial_neighborhood_size,
+            'max_neighborhood_size': max_neighborhood_size,
+            'num_changes': num_changes
+        }
+        checkpointer = Checkpointer(checkpoint_path, checkpoint_interval, 'local_search_vns', parameters, P_i, Z_j, S_k, s_jk)
+        state = checkpointer.load()
+
+    if state is None:
+        # Generate initial solution using randomized nearest neighbor heuristic
+        current_assignments, current_load_zones, _ = nearest_neighbor_minimize_max_workload_time_randomized(
+            P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times, 1000, should_stop
+        )
+        best_assignments = current_assignments
+        best_load_zones = current_load_zones
+        best_wmax, _ = evaluate_solution(best_load_zones)
+
+        stats = SearchStats() if collect_stats else None
+        initial_phase_end = time.time()
+        if stats is not None:
+            stats.trajectory.append((initial_phase_end - start_time, best_wmax))
+        moves_proposed = 0
+        moves_accepted = 0
+
+        no_improve_count = 0
+        neighborhood_size = initial_neighborhood_size
+        first_iteration = 0
+        if checkpointer is not None:
+            checkpointer.save_next()  # The initial solution is the expensive part
+    else:
+        # Resume: P_i is restored in the order left by the initial shuffles, since the neighbors sample from it
+        start_time -= state['elapsed_time']
+        P_i[:] = state['P_i']
+        current_assignments, current_load_zones = checkpointer.unpack(state['current'], P_i)
+        best_assignments, best_load_zones = checkpointer.unpack(state['best'], P_i)
+        best_wmax = state['best_wmax']
+        stats = state['stats'] if collect_stats else None
+        if collect_stats and stats is None:  # Checkpoint written without stats: the trajectory starts at the resume
+            stats = SearchStats(trajectory=[(state['elapsed_time'], best_wmax)])
+        initial_phase_end = start_time + state['initial_phase_time']
+        moves_proposed = state['moves_proposed']
+        moves_accepted = state['moves_accepted']
+        no_improve_count = state['no_improve_count']
+        neighborhood_size = state['neighborhood_size']
+        first_iteration = state['iteration']
+        random.setstate(state['random_state'])
+
+    for iteration in range(first_iteration, max_iterations):
         if no_improve_count >= max_no_improve:
             break
+        if should_stop is not None and should_stop(best_wmax):
+            break
+
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save({
+                'iteration': iteration,
+                'P_i': list(P_i),
+                'current': checkpointer.pack(current_assignments, current_load_zones, P_i),
+                'best': checkpointer.pack(best_assignments, best_load_zones, P_i),
+                'best_wmax': best_wmax,
+                'moves_proposed': moves_proposed,
+                'moves_accepted': moves_accepted,
+                'no_improve_count': no_improve_count,
+                'neighborhood_size': neighborhood_size,
+                'random_state': random.getstate(),
+                'elapsed_time': time.time() - start_time,
+                'initial_phase_time': initial_phase_end - start_time,
+                'stats': stats
+            })
 
         # Generate a neighborhood with the current size
         neighborhood = [
             generate_aggressive_neighbor(current_assignments, current_load_zones, P_i, d_jk, R_m, rp_im, classification_times, v, num_changes)
             for _ in range(neighborhood_size)
         ]
+        moves_proposed += neighborhood_size
 
         # Explicitly find the best solution in the neighborhood
         best_neighbor_assignments = None
@@ -121,10 +194,27 @@ def local_search_vns(
             best_wmax = best_neighbor_wmax
             no_improve_count = 0  # Reset no improvement counter
             neighborhood_size = initial_neighborhood_size  # Reset neighborhood size
+            moves_accepted += 1
+            if DEBUG_VERIFY:
+                verify_solution(best_assignments, best_load_zones, P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+            if stats is not None:
+                stats.trajectory.append((time.time() - start_time, best_wmax))
         else:
             no_improve_count += 1  # Increment no improvement counter if no better solution is found
             neighborhood_size = min(neighborhood_size + 1, max_neighborhood_size)  # Expand neighborhood size
 
+    if checkpointer is not None:
+        checkpointer.remove()
+
     execution_time = time.time() - start_time
 
-    return best_assignments, best_load_zones, execution_time
\ No newline at end of file
+    if stats is None:
+        return best_assignments, best_load_zones, execution_time
+
+    stats.moves_proposed = moves_proposed
+    stats.moves_accepted = moves_accepted
+    stats.evaluations = moves_proposed
+    stats.initial_phase_time = initial_phase_end - start_time
+    stats.improvement_phase_time = execution_time - stats.initial_phase_time
+
+    return best_assignments, best_load_zones, execution_time, stats
\ No newline at end of file
@@ -0,0 +1,166 @@
+import os
+import random
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from shared.data_loader.data_loader import SparseOrderSku, load_layout, load_orders
+from shared.solution import exit_zones
+from shared.utils import save_results, verify_solution
+from ptl.methods import METHODS, get_method, resolve_parameters
+
+# (P_i, rp_im, classification_times) of a wave, as returned by load_orders and orders_from_line_items
+OrderSet = Tuple[List[str], SparseOrderSku, Dict[str, float]]
+
+# Layout of the batch solved by this process: (Z_j, S_k, R_m, v, s_jk, d_jk)
+_layout = None
+
+def _init_worker(layout: Tuple, method_name: str) -> None:
+    """
+    Pool initializer: receive the layout once per worker, index it and import the method.
+    """
+    global _layout
+    _layout = layout
+    Z_j, S_k, _, _, s_jk, _ = layout
+    exit_zones(Z_j, S_k, s_jk)
+    get_method(method_name)
+
+def solve_wave(
+        name: str,
+        wave: Union[str, OrderSet],
+        method_name: str,
+        parameters: Dict[str, Any],
+        seed: Optional[int] = None
+    ) -> Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str]:
+    """
+    Solve a wave on the layout of this process and verify the solution.
+    wave is the path of a workbook with the orders (see load_orders) or an OrderSet.
+    Returns a tuple in the format expected by generate_report, with the wave name as instance name.
+    """
+    Z_j, S_k, R_m, v, s_jk, d_jk = _layout
+    P_i, rp_im, classification_times = load_orders(wave, R_m) if isinstance(wave, str) else wave
+    if len(P_i) > len(S_k):
+        raise ValueError(f"Wave '{name}' has {len(P_i)} orders for {len(S_k)} exits.")
+
+    args = (list(P_i), Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+    if seed is not None:
+        random.seed(seed)
+    assignments, load_zones, execution_time = get_method(method_name)(*args, **parameters)[:3]
+    verify_solution(assignments, load_zones, *args)
+
+    return assignments, load_zones, execution_time, name, method_name
+
+def _wave_name(wave: Union[str, Tuple[str, OrderSet]]) -> Tuple[str, Union[str, OrderSet]]:
+    if isinstance(wave, str):
+        return os.path.splitext(os.path.basename(wave))[0], wave
+    return wave
+
+class BatchSolver:
+    """
+    Solves a stream of waves (order sets) on a fixed layout with one method.
+    - The layout (zones, exits, SKUs, s_jk, d_jk) is loaded once and sent once to every worker,
+      which indexes it when it starts; a wave only carries its orders.
+    - Waves are the paths of workbooks with their orders (Pedidos and SKU_pertenece_pedido/Tiempo_SKU,
+      or Lineas_pedido), parsed by the workers, or (name, OrderSet) pairs.
+    - The waves are solved in a pool of `workers` processes (in this process when workers is 1),
+      with at most max_pending waves submitted at once, so the stream is read lazily.
+    """
+
+    def __init__(
+            self,
+            layout_instance: str,
+            method_name: str,
+            parameters: Optional[Dict[str, Any]] = None,
+            workers: int = 1,
+            seed: Optional[int] = None,
+            max_pending: Optional[int] = None
+        ):
+        self.layout = load_layout(layout_instance)
+        self.method_name = method_name
+        self.parameters = resolve_parameters(method_name, parameters or {})
+        self.workers = workers
+        self.seed = seed
+        self.max_pending = max_pending or 2 * workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'BatchSolver':
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.layout, self.method_name))
+        else:
+            _init_worker(self.layout, self.method_name)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    @property
+    def R_m(self) -> List[str]:
+        """
+        SKUs of the layout, to build OrderSets with orders_from_line_items.
+        """
+        return self.layout[2]
+
+    def solve(self, waves: Iterable[Union[str, Tuple[str, OrderSet]]]) -> Iterator[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str]]:
+        """
+        Solve every wave and yield each result (see solve_wave) as soon as it finishes.
+        The first wave that fails raises its exception, after the submitted waves are cancelled.
+        """
+        if self.executor is None:
+            for wave in waves:
+                yield solve_wave(*_wave_name(wave), self.method_name, self.parameters, self.seed)
+            return
+
+        waves = iter(waves)
+        pending = set()
+        try:
+            while True:
+                for wave in waves:
+                    pending.add(self.executor.submit(solve_wave, *_wave_name(wave), self.method_name, self.parameters, self.seed))
+                    if len(pending) >= self.max_pending:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m ptl.batch', description='Solve many waves of orders on the layout of an instance.')
+    parser.add_argument('layout', help='Instance in shared/instances_ptl whose zones, exits and SKUs the waves use.')
+    parser.add_argument('waves', nargs='+', help='Workbooks with the orders of each wave.')
+    parser.add_argument('-m', '--method', default='tabu_search', choices=list(METHODS), help='Method to solve the waves with (default: tabu_search).')
+    parser.add_argument('-p', '--param', action='append', default=[], metavar='KEY=VALUE', help='Override a method parameter, e.g. -p max_iterations=500.')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='Number of worker processes (default: one per core).')
+    parser.add_argument('--seed', type=int, default=None, help='Seed the random module before each wave.')
+    parser.add_argument('--output-dir', default='solutions', help='Folder for the solution files (default: solutions).')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from ptl.cli import parse_parameters
+
+    parser = build_parser()
+    options = parser.parse_args(argv)
+
+    try:
+        parameters = parse_parameters(options.param, [options.method])[options.method]
+    except ValueError as error:
+        parser.error(str(error))
+    missing = [wave for wave in options.waves if not os.path.isfile(wave)]
+    if missing:
+        parser.error(f"Wave files not found: {', '.join(missing)}.")
+
+    os.makedirs(options.output_dir, exist_ok=True)
+
+    # Results are saved as soon as each wave finishes
+    with BatchSolver(options.layout, options.method, parameters, options.workers, options.seed) as solver:
+        for assignments, load_zones, execution_time, wave_name, method_name in solver.solve(options.waves):
+            save_results(assignments, load_zones, f'{options.output_dir}/solution_{wave_name}_{method_name}.xlsx', wave_name)
+            print(f"{wave_name} {method_name}: Wmax = {max(load_zones.values()):.2f} ({execution_time:.4f} s)", flush=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import os
+import ast
+import argparse
+from typing import Any, Dict, List, Optional
+
+from shared.utils import save_results
+from shared.result_cache import DEFAULT_CACHE_DIR, ResultCache
+from ptl.methods import METHODS, method_parameter_names, resolve_parameters
+from ptl.runner import resolve_instances, run_jobs
+
+def _parse_value(value: str) -> Any:
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+def parse_parameters(raw_parameters: List[str], methods: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse KEY=VALUE and METHOD.KEY=VALUE options into per-method parameter overrides.
+    A bare KEY applies to every selected method that accepts it.
+    """
+    overrides = {method_name: {} for method_name in methods}
+    for raw_parameter in raw_parameters:
+        if '=' not in raw_parameter:
+            raise ValueError(f"Invalid parameter '{raw_parameter}', expected KEY=VALUE or METHOD.KEY=VALUE.")
+        key, value = raw_parameter.split('=', 1)
+        value = _parse_value(value)
+
+        if '.' in key:
+            method_name, key = key.split('.', 1)
+            if method_name not in overrides:
+                raise ValueError(f"Parameter '{raw_parameter}' targets method '{method_name}', which is not selected.")
+            overrides[method_name][key] = value
+            continue
+
+        targets = [method_name for method_name in methods if key in method_parameter_names(method_name)]
+        if not targets:
+            raise ValueError(f"No selected method accepts the parameter '{key}'.")
+        for method_name in targets:
+            overrides[method_name][key] = value
+
+    return {method_name: resolve_parameters(method_name, overrides[method_name]) for method_name in methods}
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m ptl', description='Solve PTL instances with one or more heuristic methods.')
+    parser.add_argument('instances', nargs='*', default=['*.xlsx'], help='Instance names or glob patterns in shared/instances_ptl (default: all).')
+    parser.add_argument('-m', '--methods', nargs='+', default=list(METHODS), choices=list(METHODS), help='Methods to run (default: all).')
+    parser.add_argument('-p', '--param', action='append', default=[], metavar='[METHOD.]KEY=VALUE', help='Override a method parameter, e.g. -p N=500 or -p local_search.max_no_improve=20.')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of instance x method jobs to run concurrently.')
+    parser.add_argument('--seed', type=int, default=None, help='Seed the random module before each job.')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None, metavar='DIR', help=f'Reuse seeded runs stored in DIR (default: {DEFAULT_CACHE_DIR}). Requires --seed.')
+    parser.add_argument('--output-dir', default=None, help='Folder for the solution files (default: <report>_method/solutions or solutions).')
+    parser.add_argument('--report', default=None, metavar='NAME', help='Generate the report into <NAME>_method/reports once all jobs finish.')
+    parser.add_argument('--report-workers', type=int, default=None, metavar='N', help='Processes rendering the report charts (default: one per core).')
+    parser.add_argument('--stats', action='store_true', help='Collect search counters and plot convergence curves with the report.')
+    parser.add_argument('--profile', default=None, metavar='DIR', help='Dump cProfile stats of each job to DIR/<instance>_<method>.prof.')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    options = parser.parse_args(argv)
+
+    try:
+        instances = resolve_instances(options.instances)
+        methods = parse_parameters(options.param, options.methods)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if options.cache and options.seed is None:
+        parser.error('--cache requires --seed: only seeded runs are reproducible.')
+    cache = ResultCache(options.cache) if options.cache else None
+
+    output_directory = options.output_dir or (f'{options.report}_method/solutions' if options.report else 'solutions')
+    os.makedirs(output_directory, exist_ok=True)
+
+    report_data_list = []
+    stats_list = []
+
+    # Results are saved as soon as each job finishes
+    for result, stats in run_jobs(instances, methods, options.jobs, options.seed, options.profile, options.stats, cache):
+        assignments, load_zones, execution_time, instance_name, method_name = result
+        save_results(assignments, load_zones, f'{output_directory}/solution_{instance_name}_{method_name}.xlsx', instance_name)
+        report_data_list.append(result)
+        print(f"{instance_name} {method_name}: Wmax = {max(load_zones.values()):.2f} ({execution_time:.4f} s)", flush=True)
+        if stats is not None:
+            stats_list.append((stats, instance_name, method_name))
+            print(f"    {stats.summary()}", flush=True)
+
+    if options.report:
+        # Keep the report ordered by instance and method, not by completion time
+        report_data_list.sort(key=lambda result: (instances.index(f'{result[3]}.xlsx'), options.methods.index(result[4])))
+        from shared.reports_generation.generate_report import generate_report, generate_convergence_report
+        generate_report(report_data_list, options.report, max_workers=options.report_workers)
+        if stats_list:
+            generate_convergence_report(stats_list, options.report)
@@ -0,0 +1,106 @@
+import inspect
+import importlib
+from typing import Any, Callable, Dict, List
+
+# Method name -> (module, function). Modules are imported only when the method is used.
+METHODS = {
+    'deterministic': ('constructive_method.heuristics', 'nearest_neighbor_minimize_max_workload_time'),
+    'randomized': ('constructive_method.heuristics', 'nearest_neighbor_minimize_max_workload_time_randomized'),
+    'lpt': ('constructive_method.heuristics', 'longest_processing_time'),
+    'differencing': ('constructive_method.heuristics', 'largest_differencing'),
+    'grasp': ('constructive_method.heuristics', 'grasp'),
+    'evolutionary': ('random_method.heuristics', 'evolutionary_one_plus_one'),
+    'local_search': ('local_search_method.heuristics', 'local_search_vns'),
+    'tabu_search': ('tabu_search_method.heuristics', 'tabu_search'),
+    'lns': ('lns_method.heuristics', 'zone_decomposition_lns'),
+}
+
+# Parameters that drive a run (stats, early stop, checkpoints) without changing the solution it finds
+RUN_CONTROL_PARAMETERS = ('collect_stats', 'should_stop', 'checkpoint_path', 'checkpoint_interval')
+
+# Parameters used by the method main.py scripts and the analysis tables
+DEFAULT_PARAMETERS = {
+    'deterministic': {},
+    'randomized': {'N': 1000},
+    'lpt': {},
+    'differencing': {},
+    'grasp': {
+        'N': 100,
+        'alphas': (0.0, 0.1, 0.2, 0.3, 0.5),
+        'local_search_moves': 20,
+        'reactive_interval': 10
+    },
+    'evolutionary': {'max_iterations': 1000},
+    'local_search': {
+        'max_iterations': 1000,
+        'max_no_improve': 40,
+        'initial_neighborhood_size': 5,
+        'max_neighborhood_size': 10,
+        'num_changes': 3
+    },
+    'tabu_search': {
+        'max_iterations': 1000,
+        'max_no_improve': 200,
+        'tabu_tenure': 10
+    },
+    'lns': {
+        'max_iterations': 100,
+        'max_no_improve': 10,
+        'initial_destroy_zones': 1,
+        'max_destroy_zones': 2,
+        'max_subproblem_orders': 24,
+        'subproblem_time_limit': 0.5
+    },
+}
+
+def get_method(method_name: str) -> Callable:
+    """
+    Return the heuristic function registered under method_name.
+    """
+    if method_name not in METHODS:
+        raise ValueError(f"Unknown method '{method_name}'. Available methods: {', '.join(METHODS)}.")
+    module_name, function_name = METHODS[method_name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+def method_parameter_names(method_name: str) -> List[str]:
+    """
+    Names of the tunable keyword parameters of a method (everything after the instance data).
+    """
+    parameters = list(inspect.signature(get_method(method_name)).parameters)
+    # Skip P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times, the stats switch and the stop hook
+    return [parameter for parameter in parameters[9:] if parameter not in ('collect_stats', 'should_stop')]
+
+def supports_stats(method_name: str) -> bool:
+    """
+    Whether the method can return a SearchStats object (collect_stats=True).
+    """
+    return 'collect_stats' in inspect.signature(get_method(method_name)).parameters
+
+def supports_should_stop(method_name: str) -> bool:
+    """
+    Whether the method can be stopped early through a should_stop(best Wmax) hook.
+    """
+    return 'should_stop' in inspect.signature(get_method(method_name)).parameters
+
+def resolve_parameters(method_name: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the default parameters of a method with user overrides.
+    """
+    parameters = dict(DEFAULT_PARAMETERS.get(method_name, {}))
+    parameters.update(overrides)
+    unknown = set(parameters) - set(method_parameter_names(method_name))
+    if unknown:
+        raise ValueError(f"Unknown parameters for method '{method_name}': {', '.join(sorted(unknown))}.")
+    return parameters
+
+def effective_parameters(method_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Every tunable parameter of a method with the value a run with `parameters` uses: the defaults of
+    the function signature, then DEFAULT_PARAMETERS, then `parameters`. The stats switch and the
+    stop hook are passed through. Two calls that solve the same way get the same dict.
+    """
+    signature = inspect.signature(get_method(method_name))
+    effective = {name: signature.parameters[name].default for name in method_parameter_names(method_name)}
+    effective.update(resolve_parameters(method_name, {name: value for name, value in parameters.items() if name not in ('collect_stats', 'should_stop')}))
+    effective.update({name: value for name, value in parameters.items() if name in ('collect_stats', 'should_stop')})
+    return effective
@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import queue
+import argparse
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.utils import save_results
+from ptl.methods import METHODS, resolve_parameters, supports_should_stop
+from ptl.runner import load_instance, resolve_instances, run_job
+
+DEFAULT_PORTFOLIO = ['deterministic', 'lpt', 'randomized', 'grasp', 'evolutionary', 'local_search', 'tabu_search']
+DEFAULT_PRIOR_PATH = '.ptl_portfolio_prior.json'  # Outside the result cache, which evicts its files
+
+class _Stopper:
+    """
+    should_stop hook of a portfolio run.
+    - Publishes the best Wmax of the run to the Wmax shared by the portfolio.
+    - Stops the run at the deadline, or when it is dominated: its best Wmax is worse than the
+      shared one and has not improved for `patience` seconds.
+    """
+
+    def __init__(self, shared_wmax, deadline_at: float, patience: float):
+        self.shared_wmax = shared_wmax
+        self.deadline_at = deadline_at
+        self.patience = patience
+        self.best_wmax = float('inf')
+        self.last_improvement = time.monotonic()
+        self.reason = None
+
+    def publish(self, wmax: float) -> None:
+        if wmax < self.shared_wmax.value:
+            with self.shared_wmax.get_lock():
+                if wmax < self.shared_wmax.value:
+                    self.shared_wmax.value = wmax
+
+    def __call__(self, best_wmax: float) -> bool:
+        now = time.monotonic()
+        if best_wmax < self.best_wmax:
+            self.best_wmax = best_wmax
+            self.last_improvement = now
+            self.publish(best_wmax)
+        if now >= self.deadline_at:
+            self.reason = 'deadline'
+        elif best_wmax > self.shared_wmax.value + 1e-9 and now - self.last_improvement >= self.patience:
+            self.reason = 'dominated'
+        return self.reason is not None
+
+def _run_method(
+        instance: str,
+        method_name: str,
+        parameters: Dict[str, Any],
+        seed: Optional[int],
+        shared_wmax,
+        deadline_at: float,
+        patience: float,
+        results
+    ) -> None:
+    """
+    Process target of a portfolio run: solves the instance with run_job and puts
+    (method, result, stop reason, error) on the results queue.
+    """
+    stopper = _Stopper(shared_wmax, deadline_at, patience)
+    if supports_should_stop(method_name):
+        parameters = {**parameters, 'should_stop': stopper}
+    try:
+        result, _ = run_job(instance, method_name, parameters, seed)
+    except Exception as error:
+        results.put((method_name, None, None, f'{type(error).__name__}: {error}'))
+        return
+    stopper.publish(max(result[1].values()))
+    results.put((method_name, result, stopper.reason, None))
+
+def size_class(n_orders: int) -> str:
+    """
+    Size class of an instance in the prior: the power of two range of its number of orders
+    (e.g. '32-63' for 40 or 60 orders), so waves of similar sizes share what the prior learned.
+    """
+    low = 1 << (max(n_orders, 1).bit_length() - 1)
+    return f'{low}-{2 * low - 1}'
+
+class Portfolio:
+    """
+    Races several methods on one instance under a shared deadline and returns the best solution.
+    - Each method runs in its own process, started from a process with the instance already parsed.
+    - The runs share the best Wmax found so far (multiprocessing.Value). A search method stops at
+      the deadline or when it is dominated (see _Stopper); constructives just run to completion.
+    - Runs still going `grace` seconds after the deadline are terminated, so a solve returns
+      within deadline + grace seconds.
+    - The winner of each solve (lowest Wmax, then lowest execution time) is counted per size class
+      in a JSON prior. With fewer workers than methods, the methods that won most often on the size
+      class start first, and max_methods keeps only the most frequent winners.
+    """
+
+    def __init__(
+            self,
+            methods: Optional[List[str]] = None,
+            parameters: Optional[Dict[str, Dict[str, Any]]] = None,
+            workers: Optional[int] = None,
+            patience: float = 1.0,
+            grace: float = 1.0,
+            prior_path: Optional[str] = DEFAULT_PRIOR_PATH,
+            max_methods: Optional[int] = None
+        ):
+        self.methods = list(methods or DEFAULT_PORTFOLIO)
+        unknown = [method_name for method_name in self.methods if method_name not in METHODS]
+        if unknown:
+            raise ValueError(f"Unknown methods: {', '.join(unknown)}. Available methods: {', '.join(METHODS)}.")
+        parameters = parameters or {}
+        self.parameters = {method_name: resolve_parameters(method_name, parameters.get(method_name, {})) for method_name in self.methods}
+        self.workers = workers or len(self.methods)
+        self.patience = patience
+        self.grace = grace
+        self.prior_path = prior_path
+        self.max_methods = max_methods
+
+    def load_prior(self) -> Dict[str, Dict[str, int]]:
+        """
+        Wins per size class and method, {} if there is no prior yet.
+        """
+        if not self.prior_path:
+            return {}
+        try:
+            with open(self.prior_path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def record_winner(self, n_orders: int, method_name: str) -> None:
+        if not self.prior_path:
+            return
+        prior = self.load_prior()
+        wins = prior.setdefault(size_class(n_orders), {})
+        wins[method_name] = wins.get(method_name, 0) + 1
+        os.makedirs(os.path.dirname(os.path.abspath(self.prior_path)), exist_ok=True)
+        temporary_path = f'{self.prior_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump(prior, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.prior_path)
+
+    def ranked_methods(self, n_orders: int) -> List[str]:
+        """
+        Portfolio methods ordered by their wins on the size class (ties keep the configured order).
+        """
+        wins = self.load_prior().get(size_class(n_orders), {})
+        ranked = sorted(self.methods, key=lambda method_name: -wins.get(method_name, 0))
+        return ranked[:self.max_methods] if self.max_methods else ranked
+
+    def solve(self, instance: str, deadline: float, seed: Optional[int] = None) -> Tuple[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str], Dict[str, Dict[str, Any]]]:
+        """
+        Solve an instance with the portfolio within `deadline` seconds (plus the grace period),
+        counted from the call, so parsing an instance not loaded yet by this process counts too.
+        Returns the best result, in the format of run_job, and per method its Wmax, execution
+        time and why it stopped ('deadline', 'dominated', 'terminated', or None if it finished),
+        or the error it raised.
+        Raises TimeoutError if no method finished in time.
+        """
+        start_time = time.monotonic()
+        deadline_at = start_time + deadline
+        n_orders = len(load_instance(instance)[0])  # Parsed before the runs start, so forked runs inherit it
+        pending = self.ranked_methods(n_orders)
+
+        shared_wmax = multiprocessing.Value('d', float('inf'))
+        results = multiprocessing.Queue()
+        running = {}
+        runs = {}
+
+        def start_next() -> None:
+            method_name = pending.pop(0)
+            process = multiprocessing.Process(
+                target=_run_method,
+                args=(instance, method_name, self.parameters[method_name], seed, shared_wmax, deadline_at, self.patience, results)
+            )
+            process.start()
+            running[method_name] = process
+
+        try:
+            while pending and len(running) < self.workers:
+                start_next()
+            while running:
+                remaining = deadline_at + self.grace - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    method_name, result, reason, error = results.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                running.pop(method_name).join()
+                if error is not None:
+                    runs[method_name] = {'error': error}
+                else:
+                    runs[method_name] = {'wmax': max(result[1].values()), 'execution_time': result[2], 'stopped': reason, 'result': result}
+                if pending and time.monotonic() < deadline_at:
+                    start_next()
+        finally:
+            for method_name, process in running.items():
+                process.terminate()
+                process.join()
+                runs[method_name] = {'stopped': 'terminated'}
+            results.close()
+
+        finished = [run for run in runs.values() if 'result' in run]
+        if not finished:
+            raise TimeoutError(f"No method of the portfolio solved '{instance}' within {deadline} seconds.")
+        winner = min(finished, key=lambda run: (round(run['wmax'], 6), run['execution_time']))['result']
+        self.record_winner(n_orders, winner[4])
+
+        for run in runs.values():
+            run.pop('result', None)
+        return winner, runs
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m ptl.portfolio', description='Race several methods on an instance and keep the best solution within a deadline.')
+    parser.add_argument('instances', nargs='+', help='Instance names or glob patterns in shared/instances_ptl.')
+    parser.add_argument('-m', '--methods', nargs='+', default=DEFAULT_PORTFOLIO, choices=list(METHODS), help=f"Methods of the portfolio (default: {' '.join(DEFAULT_PORTFOLIO)}).")
+    parser.add_argument('-p', '--param', action='append', default=[], metavar='[METHOD.]KEY=VALUE', help='Override a method parameter, e.g. -p tabu_search.max_iterations=100000.')
+    parser.add_argument('-d', '--deadline', type=float, default=10.0, help='Seconds to solve each instance (default: 10).')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Methods run at once (default: all).')
+    parser.add_argument('--max-methods', type=int, default=None, help='Only run the methods that won most often on the size class.')
+    parser.add_argument('--patience', type=float, default=1.0, help='Seconds a run may stay behind the best Wmax without improving (default: 1).')
+    parser.add_argument('--grace', type=float, default=1.0, help='Seconds after the deadline before unfinished runs are terminated (default: 1).')
+    parser.add_argument('--prior', default=DEFAULT_PRIOR_PATH, help=f'JSON file with the wins per size class and method (default: {DEFAULT_PRIOR_PATH}).')
+    parser.add_argument('--seed', type=int, default=None, help='Seed the random module of every run.')
+    parser.add_argument('--output-dir', default='solutions', help='Folder for the solution files (default: solutions).')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from ptl.cli import parse_parameters
+
+    parser = build_parser()
+    options = parser.parse_args(argv)
+
+    try:
+        instances = resolve_instances(options.instances)
+        parameters = parse_parameters(options.param, options.methods)
+        portfolio = Portfolio(options.methods, parameters, options.workers, options.patience, options.grace, options.prior, options.max_methods)
+    except ValueError as error:
+        parser.error(str(error))
+
+    os.makedirs(options.output_dir, exist_ok=True)
+
+    for instance in instances:
+        start_time = time.monotonic()
+        (assignments, load_zones, execution_time, instance_name, method_name), runs = portfolio.solve(instance, options.deadline, options.seed)
+        save_results(assignments, load_zones, f'{options.output_dir}/solution_{instance_name}_portfolio.xlsx', instance_name)
+        print(f"{instance_name} portfolio: Wmax = {max(load_zones.values()):.2f} by {method_name} ({time.monotonic() - start_time:.2f} s)", flush=True)
+        for run_method, run in runs.items():
+            if 'error' in run:
+                print(f"    {run_method}: {run['error']}", flush=True)
+            elif 'wmax' in run:
+                print(f"    {run_method}: Wmax = {run['wmax']:.2f} ({run['execution_time']:.4f} s){', stopped: ' + run['stopped'] if run['stopped'] else ''}", flush=True)
+            else:
+                print(f"    {run_method}: {run['stopped']}", flush=True)
+
+if __name__ == '__main__':
+    main()
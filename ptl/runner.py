@@ -0,0 +1,125 @@
+import os
+import random
+import fnmatch
+import cProfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from shared.data_loader.data_loader import load_data
+from shared.utils import verify_solution
+from shared.search_stats import SearchStats
+from shared.result_cache import ResultCache
+from ptl.methods import METHODS, RUN_CONTROL_PARAMETERS, effective_parameters, get_method, supports_stats
+
+INSTANCES_DIR = 'shared/instances_ptl'
+
+# Instances already parsed by this process, so a worker running several methods reads each file once
+_loaded_instances = {}
+
+def resolve_instances(patterns: List[str]) -> List[str]:
+    """
+    Expand instance glob patterns (e.g. '40_*' or '*_heterogeneous.xlsx') against the instances folder.
+    """
+    available = sorted(name for name in os.listdir(INSTANCES_DIR) if name.endswith('.xlsx'))
+    instances = []
+    for pattern in patterns:
+        matches = [name for name in available if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(name, f'{pattern}.xlsx')]
+        if not matches:
+            raise ValueError(f"No instance in '{INSTANCES_DIR}' matches '{pattern}'.")
+        instances.extend(name for name in matches if name not in instances)
+    return instances
+
+def load_instance(instance: str) -> Tuple:
+    """
+    load_data of an instance, parsed once per process.
+    """
+    if instance not in _loaded_instances:
+        _loaded_instances[instance] = load_data(instance)
+    return _loaded_instances[instance]
+
+def run_job(
+        instance: str,
+        method_name: str,
+        parameters: Dict[str, Any],
+        seed: Optional[int] = None,
+        profile_dir: Optional[str] = None,
+        collect_stats: bool = False,
+        cache: Optional[ResultCache] = None
+    ) -> Tuple[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str], Optional[SearchStats]]:
+    """
+    Solve one instance with one method and verify the solution (cached solutions included).
+    Returns a tuple in the format expected by generate_report and the search stats
+    (None unless collect_stats is set and the method supports it).
+    - The method is called with its effective parameters (see effective_parameters).
+    - Seeded runs are looked up in and stored to the cache when one is given, keyed by their
+      effective parameters without the run control ones (RUN_CONTROL_PARAMETERS). Profiled runs and
+      runs collecting stats are always solved, and runs with a should_stop hook, whose result
+      depends on when it fires, are not cached.
+    """
+    instance_name = instance.split('.')[0]
+    args = load_instance(instance)
+    args = (list(args[0]),) + tuple(args[1:])  # Some methods shuffle P_i in place
+
+    parameters = effective_parameters(method_name, parameters)
+
+    cache_key = None
+    if cache is not None and seed is not None and 'should_stop' not in parameters:
+        key_parameters = {name: value for name, value in parameters.items() if name not in RUN_CONTROL_PARAMETERS}
+        cache_key = cache.key(instance, method_name, METHODS[method_name][0], key_parameters, seed)
+        cached_solution = None if (profile_dir or collect_stats) else cache.get(cache_key)
+        if cached_solution is not None:
+            assignments, load_zones, execution_time = cached_solution
+            verify_solution(assignments, load_zones, *args)
+            return (assignments, load_zones, execution_time, instance_name, method_name), None
+
+    func = get_method(method_name)
+    collect_stats = collect_stats and supports_stats(method_name)
+    if collect_stats:
+        parameters = {**parameters, 'collect_stats': True}
+
+    if seed is not None:
+        random.seed(seed)
+
+    if profile_dir:
+        profiler = cProfile.Profile()
+        solution = profiler.runcall(func, *args, **parameters)
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(f'{profile_dir}/{instance_name}_{method_name}.prof')
+    else:
+        solution = func(*args, **parameters)
+
+    assignments, load_zones, execution_time = solution[:3]
+    stats = solution[3] if collect_stats else None
+
+    verify_solution(assignments, load_zones, *args)
+
+    if cache_key is not None:
+        cache.put(cache_key, assignments, load_zones, execution_time)
+
+    return (assignments, load_zones, execution_time, instance_name, method_name), stats
+
+def run_jobs(
+        instances: List[str],
+        methods: Dict[str, Dict[str, Any]],
+        jobs: int = 1,
+        seed: Optional[int] = None,
+        profile_dir: Optional[str] = None,
+        collect_stats: bool = False,
+        cache: Optional[ResultCache] = None
+    ) -> Iterator[Tuple[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str], Optional[SearchStats]]]:
+    """
+    Run every instance x method job and yield each (result, stats) as soon as it finishes.
+    methods: method name -> parameters for that method.
+    - Jobs run in a pool of `jobs` processes (in this process when jobs is 1).
+    """
+    job_list = [(instance, method_name, parameters, seed, profile_dir, collect_stats, cache) for instance in instances for method_name, parameters in methods.items()]
+
+    if jobs <= 1:
+        for job in job_list:
+            yield run_job(*job)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_job, *job) for job in job_list]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,280 @@
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ptl.methods import METHODS, get_method, resolve_parameters, supports_should_stop
+from ptl.runner import load_instance, resolve_instances, run_job
+
+MAX_BODY_BYTES = 1 << 20
+LATENCY_WINDOW = 1000  # Requests kept for the latency percentiles
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+def _warm_worker(instances: List[str]) -> None:
+    """
+    Pool initializer: parse the instances and import every method once per worker.
+    """
+    for instance in instances:
+        load_instance(instance)
+    for method_name in METHODS:
+        get_method(method_name)
+
+class SolveError(Exception):
+    """
+    A solve failed in its worker (the request itself was valid).
+    """
+
+def _ping() -> None:
+    pass
+
+def _solve(instance: str, method_name: str, parameters: Dict[str, Any], seed: Optional[int], deadline: Optional[float]) -> Dict[str, Any]:
+    """
+    Worker side of a solve request: run_job, converted to a JSON friendly dictionary.
+    - With a deadline (time.monotonic() of the service process, which is system wide), a method
+      that supports should_stop returns its best solution once the deadline is reached.
+    """
+    if deadline is not None and supports_should_stop(method_name):
+        parameters = {**parameters, 'should_stop': lambda best_wmax: time.monotonic() >= deadline}
+    (assignments, load_zones, execution_time, _, _), _ = run_job(instance, method_name, parameters, seed)
+    wmax = max(load_zones.values())
+    return {
+        'wmax': float(wmax),
+        'wmax_wmin': float(wmax - min(load_zones.values())),
+        'execution_time': execution_time,
+        'assignments': {order: [zone, exit_, float(time_)] for order, (zone, exit_, time_) in assignments.items()},
+        'load_zones': {zone: float(load) for zone, load in load_zones.items()}
+    }
+
+def _percentiles(values: deque) -> Dict[str, float]:
+    if not values:
+        return {}
+    p50, p90, p99 = np.percentile(np.fromiter(values, dtype=np.float64), [50, 90, 99])
+    return {'p50': float(p50), 'p90': float(p90), 'p99': float(p99), 'max': float(max(values))}
+
+class SolverService:
+    """
+    Local solver service: solve requests wait in an asyncio queue and are dispatched to a warm process pool.
+    - Every worker parses the preloaded instances and imports the heuristics when it starts.
+    - At most `workers` requests are solved at once; the rest wait in a queue of queue_size requests.
+    - A request with a budget (seconds) fails with a timeout if it is still queued when its budget
+      runs out. A running search method stops at the end of the budget (should_stop) and returns its
+      best solution, which is awaited for `grace` more seconds; constructive methods, which do not
+      take should_stop, run to completion and get the same grace period.
+    """
+
+    def __init__(self, instances: List[str], workers: int = 1, queue_size: int = 100, grace: float = 1.0):
+        self.instances = instances
+        self.workers = workers
+        self.grace = grace
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.dispatchers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.counters = {'completed': 0, 'failed': 0, 'rejected': 0, 'timed_out': 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.queue_waits = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker, initargs=(self.instances,))
+        # One task per worker, so every worker is started and warm before the first request
+        await asyncio.gather(*[loop.run_in_executor(self.executor, _ping) for _ in range(self.workers)])
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job, deadline, enqueued_at, future = await self.queue.get()
+            try:
+                if future.done():
+                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    future.set_exception(asyncio.TimeoutError())
+                    continue
+                self.queue_waits.append(time.monotonic() - enqueued_at)
+                self.in_flight += 1
+                try:
+                    solution = await loop.run_in_executor(self.executor, _solve, *job, deadline)
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(SolveError(f'{type(error).__name__}: {error}'))
+                else:
+                    if not future.done():
+                        future.set_result(solution)
+                finally:
+                    self.in_flight -= 1
+            finally:
+                self.queue.task_done()
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Solve a request {"instance", "method", "parameters"?, "seed"?, "budget"?}.
+        Raises ValueError for invalid requests, asyncio.QueueFull when the queue is full,
+        asyncio.TimeoutError when the budget runs out and SolveError when the solve fails.
+        """
+        received_at = time.monotonic()
+        if not isinstance(request, dict):
+            raise ValueError('A solve request must be a JSON object.')
+        instance = request.get('instance')
+        method_name = request.get('method')
+        if not isinstance(instance, str) or not isinstance(method_name, str):
+            raise ValueError("A solve request needs an 'instance' and a 'method'.")
+        instances = resolve_instances([instance])
+        if len(instances) != 1:
+            raise ValueError(f"'{instance}' matches several instances: {', '.join(instances)}.")
+        parameters = resolve_parameters(method_name, request.get('parameters') or {})
+        budget = request.get('budget')
+        deadline = received_at + float(budget) if budget is not None else None
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait(((instances[0], method_name, parameters, request.get('seed')), deadline, received_at, future))
+        except asyncio.QueueFull:
+            self.counters['rejected'] += 1
+            raise
+
+        try:
+            # The search stops at the deadline, so its solution arrives just after it
+            solution = await asyncio.wait_for(future, None if deadline is None else max(0.0, deadline + self.grace - time.monotonic()))
+        except asyncio.TimeoutError:
+            self.counters['timed_out'] += 1
+            raise
+        except Exception:
+            self.counters['failed'] += 1
+            raise
+
+        latency = time.monotonic() - received_at
+        self.latencies.append(latency)
+        self.counters['completed'] += 1
+        return {'instance': instances[0], 'method': method_name, 'latency': latency, **solution}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'in_flight': self.in_flight,
+            'workers': self.workers,
+            **self.counters,
+            'latency_seconds': _percentiles(self.latencies),
+            'queue_wait_seconds': _percentiles(self.queue_waits)
+        }
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Minimal HTTP/1.1 handler: POST /solve and GET /metrics, JSON in and out, one request per connection.
+        """
+        try:
+            try:
+                http_method, path, body = await _read_request(reader)
+            except (ValueError, asyncio.IncompleteReadError) as error:
+                await _write_response(writer, 400, {'error': str(error) or 'Malformed request.'})
+                return
+
+            if path == '/metrics':
+                if http_method != 'GET':
+                    await _write_response(writer, 405, {'error': 'Use GET /metrics.'})
+                    return
+                await _write_response(writer, 200, self.metrics())
+                return
+
+            if path != '/solve':
+                await _write_response(writer, 404, {'error': f"Unknown path '{path}'."})
+                return
+            if http_method != 'POST':
+                await _write_response(writer, 405, {'error': 'Use POST /solve.'})
+                return
+
+            try:
+                response = await self.solve(json.loads(body or b'{}'))
+            except (ValueError, TypeError) as error:  # Includes invalid JSON
+                await _write_response(writer, 400, {'error': str(error)})
+            except asyncio.QueueFull:
+                await _write_response(writer, 503, {'error': 'The request queue is full.'})
+            except asyncio.TimeoutError:
+                await _write_response(writer, 504, {'error': 'The request was not solved within its budget.'})
+            except SolveError as error:
+                await _write_response(writer, 500, {'error': str(error)})
+            except Exception as error:
+                await _write_response(writer, 500, {'error': f'{type(error).__name__}: {error}'})
+            else:
+                await _write_response(writer, 200, response)
+        finally:
+            writer.close()
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise ValueError('Malformed request line.')
+    http_method, path, _ = request_line
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    content_length = int(headers.get('content-length', 0))
+    if content_length > MAX_BODY_BYTES:
+        raise ValueError('Request body too large.')
+    body = await reader.readexactly(content_length) if content_length else b''
+    return http_method.upper(), path.split('?', 1)[0], body
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload).encode()
+    writer.write(
+        f'HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n'
+        f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body
+    )
+    await writer.drain()
+
+async def serve(instances: List[str], host: str = '127.0.0.1', port: int = 8765, workers: int = 1, queue_size: int = 100, grace: float = 1.0) -> None:
+    service = SolverService(instances, workers, queue_size, grace)
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"PTL solver service on http://{host}:{port} ({workers} workers, {len(instances)} preloaded instances)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m ptl.service', description='Serve PTL solve requests from a warm process pool.')
+    parser.add_argument('instances', nargs='*', default=['*.xlsx'], help='Instances to preload in every worker (default: all).')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765).')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of worker processes.')
+    parser.add_argument('--queue-size', type=int, default=100, help='Requests that can wait for a worker before new ones are rejected.')
+    parser.add_argument('--grace', type=float, default=1.0, help='Seconds a running solve may take past its budget before the request times out (default: 1).')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    options = parser.parse_args(argv)
+
+    try:
+        instances = resolve_instances(options.instances)
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        asyncio.run(serve(instances, options.host, options.port, options.workers, options.queue_size, options.grace))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
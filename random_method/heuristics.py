@@ -1,8 +1,10 @@
 import time
 import random
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List, Optional, Union
 
-from shared.utils import evaluate_solution
+from shared.utils import DEBUG_VERIFY, evaluate_solution, sku_count, verify_solution
+from shared.search_stats import SearchStats
+from shared.checkpoint import Checkpointer
 from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
 
 def mutate_solution(
@@ -42,7 +44,7 @@ def mutate_solution(
     # Recalculate classification times for the affected orders
     for order in [order1, order2]:
         zone, new_exit, _ = mutated_assignments[order]
-        num_skus = sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1)
+        num_skus = sku_count(order, R_m, rp_im)
         new_classification_time = classification_times[order]
         new_classification_time += num_skus * 2 * (d_jk[zone, new_exit] / v)  # Travel time per SKU
         mutated_assignments[order] = (zone, new_exit, new_classification_time)
@@ -62,11 +64,14 @@ def evolutionary_one_plus_one(
         rp_im: Dict[Tuple[str, str], int], 
         d_jk: Dict[Tuple[str, str], float], 
         classification_times: Dict[str, float],
-        max_iterations: int = 100
-    ) -> Tuple[
-            Dict[str, Tuple[str, str, float]], 
-            Dict[str, float],
-            float
+        max_iterations: int = 100,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+        should_stop: Optional[Callable[[float], bool]] = None,
+        collect_stats: bool = False
+    ) -> Union[
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float],
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, SearchStats]
         ]:
     """
     Implements (1+1) Evolutionary Strategy:
@@ -74,20 +79,69 @@ def evolutionary_one_plus_one(
     - Mutates the solution at each iteration.
     - Accepts mutations if they improve Wmax.
     - Stops after max_iterations or if no improvement occurs.
+    - With collect_stats=True, a SearchStats object is returned after the execution time.
+    - With checkpoint_path, the state of the search (incumbent, RNG state, counters) is saved
+      every checkpoint_interval seconds, and a run finding a checkpoint there resumes it exactly.
+      The checkpoint is removed when the run finishes.
+    - With should_stop, should_stop(best Wmax) is called once per iteration and the best solution
+      found so far is returned as soon as it returns True (e.g. at a deadline).
     """
 
     start_time = time.time()
 
-    # Generate initial solution using nearest neighbor heuristic
-    current_assignments, current_load_zones, _ = nearest_neighbor_minimize_max_workload_time(
-        P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
-    )
+    checkpointer = None
+    state = None
+    if checkpoint_path:
+        checkpointer = Checkpointer(checkpoint_path, checkpoint_interval, 'evolutionary_one_plus_one', {'max_iterations': max_iterations}, P_i, Z_j, S_k, s_jk)
+        state = checkpointer.load()
 
-    best_assignments = current_assignments
-    best_load_zones = current_load_zones
-    best_wmax, _ = evaluate_solution(best_load_zones)
+    if state is None:
+        # Generate initial solution using nearest neighbor heuristic
+        current_assignments, current_load_zones, _ = nearest_neighbor_minimize_max_workload_time(
+            P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
+        )
+
+        best_assignments = current_assignments
+        best_load_zones = current_load_zones
+        best_wmax, _ = evaluate_solution(best_load_zones)
+
+        stats = SearchStats() if collect_stats else None
+        initial_phase_end = time.time()
+        if stats is not None:
+            stats.trajectory.append((initial_phase_end - start_time, best_wmax))
+        moves_accepted = 0
+        first_iteration = 0
+    else:
+        # Resume: the elapsed time of the previous runs is kept in the execution time
+        start_time -= state['elapsed_time']
+        best_assignments, best_load_zones = checkpointer.unpack(state['best'], P_i)
+        best_wmax = state['best_wmax']
+        stats = state['stats'] if collect_stats else None
+        if collect_stats and stats is None:  # Checkpoint written without stats: the trajectory starts at the resume
+            stats = SearchStats(trajectory=[(state['elapsed_time'], best_wmax)])
+        initial_phase_end = start_time + state['initial_phase_time']
+        moves_accepted = state['moves_accepted']
+        first_iteration = state['iteration']
+        random.setstate(state['random_state'])
+
+    iterations = max_iterations
+    for iteration in range(first_iteration, max_iterations):
+        if should_stop is not None and should_stop(best_wmax):
+            iterations = iteration
+            break
+
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save({
+                'iteration': iteration,
+                'best': checkpointer.pack(best_assignments, best_load_zones, P_i),
+                'best_wmax': best_wmax,
+                'moves_accepted': moves_accepted,
+                'random_state': random.getstate(),
+                'elapsed_time': time.time() - start_time,
+                'initial_phase_time': initial_phase_end - start_time,
+                'stats': stats
+            })
 
-    for _ in range(max_iterations):
         # Mutate the current solution
         new_assignments, new_load_zones = mutate_solution(
             best_assignments, best_load_zones, P_i, d_jk, R_m,
@@ -102,7 +156,24 @@ def evolutionary_one_plus_one(
             best_assignments = new_assignments
             best_load_zones = new_load_zones
             best_wmax = new_wmax
+            moves_accepted += 1
+            if DEBUG_VERIFY:
+                verify_solution(best_assignments, best_load_zones, P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+            if stats is not None:
+                stats.trajectory.append((time.time() - start_time, best_wmax))
+
+    if checkpointer is not None:
+        checkpointer.remove()
 
     execution_time = time.time() - start_time
 
-    return best_assignments, best_load_zones, execution_time
\ No newline at end of file
+    if stats is None:
+        return best_assignments, best_load_zones, execution_time
+
+    stats.moves_proposed = iterations
+    stats.moves_accepted = moves_accepted
+    stats.evaluations = iterations
+    stats.initial_phase_time = initial_phase_end - start_time
+    stats.improvement_phase_time = execution_time - stats.initial_phase_time
+
+    return best_assignments, best_load_zones, execution_time, stats
\ No newline at end of file
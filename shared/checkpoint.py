@@ -0,0 +1,92 @@
+import os
+import time
+import pickle
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.solution import FREE_EXIT, Solution, exit_zones
+
+# Bump when the layout of the checkpoint files changes
+CHECKPOINT_FORMAT_VERSION = 1
+
+class Checkpointer:
+    """
+    Periodic checkpoints of a search run, so a preempted run can be resumed exactly.
+    - The state dictionary is pickled to a temporary file that is renamed into place,
+      so a run killed while writing never leaves a truncated checkpoint.
+    - Solutions are stored as Solution arrays (exit and cost per order, load per zone).
+    - The checkpoint records the method, its parameters and the instance; resuming it
+      with a different run raises ValueError.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            interval: float,
+            method_name: str,
+            parameters: Dict[str, Any],
+            P_i: List[str],
+            Z_j: List[str],
+            S_k: List[str],
+            s_jk: Dict[Tuple[str, str], int]
+        ):
+        self.path = path
+        self.interval = interval
+        self.run = {
+            'format': CHECKPOINT_FORMAT_VERSION,
+            'method': method_name,
+            'parameters': parameters,
+            'orders': sorted(P_i),
+            'zones': list(Z_j),
+            'exits': list(S_k)
+        }
+        self.Z_j, self.S_k = tuple(Z_j), tuple(S_k)
+        self.exit_zone = exit_zones(Z_j, S_k, s_jk)
+        self.last_save = time.monotonic()
+
+    def pack(self, assignments: Dict[str, Tuple[str, str, float]], load_zones: Dict[str, float], P_i: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        solution = Solution.from_assignments(assignments, load_zones, P_i, self.Z_j, self.S_k, self.exit_zone)
+        return solution.order_exit, solution.order_cost, solution.zone_load
+
+    def unpack(self, packed: Tuple[np.ndarray, np.ndarray, np.ndarray], P_i: List[str]) -> Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float]]:
+        order_exit, order_cost, zone_load = packed
+        exit_order = np.full(len(self.S_k), FREE_EXIT, dtype=np.int32)
+        exit_order[order_exit] = np.arange(len(order_exit), dtype=np.int32)
+        return Solution(tuple(P_i), self.Z_j, self.S_k, self.exit_zone, order_exit, exit_order, order_cost, zone_load).to_assignments()
+
+    def due(self) -> bool:
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save_next(self) -> None:
+        """
+        Make the next due() call return True, e.g. to save right after an expensive initial phase.
+        """
+        self.last_save = float('-inf')
+
+    def save(self, state: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            pickle.dump({'run': self.run, 'state': state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.path)
+        self.last_save = time.monotonic()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        State of the last checkpoint, or None if there is none.
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                checkpoint = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        if checkpoint['run'] != self.run:
+            raise ValueError(f"The checkpoint '{self.path}' belongs to a different run (method, parameters or instance).")
+        return checkpoint['state']
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
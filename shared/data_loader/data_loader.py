@@ -1,24 +1,119 @@
-import pandas as pd
-from typing import Dict, Tuple, List
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, Tuple, List
 
-def load_data(instance_name: str) -> Tuple[
-        List[str], 
-        List[str], 
-        List[str], 
-        List[str], 
-        float, 
-        Dict[Tuple[str, str], int], 
-        Dict[Tuple[str, str], int], 
-        Dict[Tuple[str, str], float], 
-        Dict[Tuple[str, str], float],
-        Dict[str, float]
+LINE_ITEMS_SHEET = 'Lineas_pedido'  # Optional long format sheet: one (order, sku, time) row per line item
+
+class SparseOrderSku(Mapping):
+    """
+    Read-only {(order, sku): value} mapping stored in CSR form, keeping only the nonzero cells.
+    - indptr[i]:indptr[i + 1] is the slice of indices/data of order orders[i], with sorted sku indices.
+    - Zero cells are not keys, so rp_im.get((order, sku), 0) behaves as with the dense dict.
+    """
+
+    __slots__ = ('orders', 'skus', 'order_index', 'sku_index', 'indptr', 'indices', 'data')
+
+    def __init__(self, orders: List[str], skus: List[str], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.orders = orders
+        self.skus = skus
+        self.order_index = {order: i for i, order in enumerate(orders)}
+        self.sku_index = {sku: m for m, sku in enumerate(skus)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def from_triplets(cls, orders: List[str], skus: List[str], rows: np.ndarray, columns: np.ndarray, values: np.ndarray) -> 'SparseOrderSku':
+        """
+        Build the matrix from (row, column, value) index triplets in any order.
+        """
+        sort = np.lexsort((columns, rows))
+        indptr = np.zeros(len(orders) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(orders)), out=indptr[1:])
+        return cls(orders, skus, indptr, columns[sort].astype(np.int32), values[sort])
+
+    def count_in_row(self, order: str, value: int = 1) -> int:
+        """
+        Number of SKUs of an order whose cell equals value, read from its CSR row.
+        """
+        i = self.order_index[order]
+        return int(np.count_nonzero(self.data[self.indptr[i]:self.indptr[i + 1]] == value))
+
+    def __getitem__(self, key: Tuple[str, str]):
+        order, sku = key
+        if order not in self.order_index or sku not in self.sku_index:
+            raise KeyError(key)
+        i, m = self.order_index[order], self.sku_index[sku]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        position = start + np.searchsorted(self.indices[start:end], m)
+        if position == end or self.indices[position] != m:
+            raise KeyError(key)
+        return self.data[position].item()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for i, order in enumerate(self.orders):
+            for m in self.indices[self.indptr[i]:self.indptr[i + 1]].tolist():
+                yield order, self.skus[m]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+def _read_line_items(workbook, P_i: List[str], R_m: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stream the (order, sku, time) triplets of the line items of an instance workbook opened in read-only mode.
+    - From the LINE_ITEMS_SHEET sheet if the workbook has one.
+    - Otherwise from the wide SKU_pertenece_pedido and Tiempo_SKU sheets, row by row.
+    Only line items are kept, so memory grows with the number of line items, not orders x SKUs.
+    """
+    order_index = {order: i for i, order in enumerate(P_i)}
+    sku_index = {sku: m for m, sku in enumerate(R_m)}
+    rows, columns, times = [], [], []
+
+    if LINE_ITEMS_SHEET in workbook.sheetnames:
+        line_items = workbook[LINE_ITEMS_SHEET].iter_rows(min_row=2, values_only=True)
+        for order, sku, time in line_items:
+            if order is None:
+                continue
+            rows.append(order_index[order])
+            columns.append(sku_index[sku])
+            times.append(time)
+    else:
+        membership = workbook['SKU_pertenece_pedido'].iter_rows(values_only=True)
+        sku_times = workbook['Tiempo_SKU'].iter_rows(values_only=True)
+        membership_header, times_header = next(membership), next(sku_times)
+        if membership_header != times_header:
+            raise ValueError("SKU_pertenece_pedido and Tiempo_SKU have different SKU columns")
+        header_columns = np.array([sku_index[sku] for sku in membership_header[1:]], dtype=np.int32)
+
+        for membership_row, times_row in zip(membership, sku_times):
+            order = membership_row[0]
+            if order is None:
+                continue
+            if times_row[0] != order:
+                raise ValueError("SKU_pertenece_pedido and Tiempo_SKU list the orders in a different order")
+            in_order = np.flatnonzero(np.array(membership_row[1:], dtype=np.float64) == 1)
+            rows.extend([order_index[order]] * len(in_order))
+            columns.extend(header_columns[in_order].tolist())
+            times.extend(times_row[1 + m] for m in in_order.tolist())
+
+    return np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int32), np.array(times, dtype=np.float64)
+
+def load_layout(instance_name: str) -> Tuple[
+        List[str],
+        List[str],
+        List[str],
+        float,
+        Dict[Tuple[str, str], int],
+        Dict[Tuple[str, str], float]
     ]:
     """
-    Load data from an Excel file containing the instance model.
+    Load the layout of an instance: the zones, exits, SKUs, speed and the s_jk and d_jk matrices.
+    Returns (Z_j, S_k, R_m, v, s_jk, d_jk).
     """
+    import pandas as pd  # Imported lazily so the heuristics can be imported without pandas
+
     excel_model = pd.ExcelFile(f'shared/instances_ptl/{instance_name}')
 
-    P_i = list(pd.read_excel(excel_model, 'Pedidos', index_col=0).index)
     Z_j = list(pd.read_excel(excel_model, 'Zonas', index_col=0).index)
     S_k = list(pd.read_excel(excel_model, 'Salidas', index_col=0).index)
     R_m = list(pd.read_excel(excel_model, 'SKU', index_col=0).index)
@@ -27,18 +122,77 @@ def load_data(instance_name: str) -> Tuple[
     v = parameters['v'].iloc[0]
 
     s_jk_dataframe = pd.read_excel(excel_model, 'Salidas_pertenece_zona', index_col=0)
-    rp_im_dataframe = pd.read_excel(excel_model, 'SKU_pertenece_pedido', index_col=0)
     d_jk_dataframe = pd.read_excel(excel_model, 'Tiempo_salida', index_col=0)
-    tr_im_dataframe = pd.read_excel(excel_model, 'Tiempo_SKU', index_col=0)
 
     s_jk = {(j, k): s_jk_dataframe.at[j, k] for k in S_k for j in Z_j}
-    rp_im = {(i, m): rp_im_dataframe.at[i, m] for m in R_m for i in P_i}
     d_jk = {(j, k): d_jk_dataframe.at[j, k] for k in S_k for j in Z_j}
-    tr_im = {(i, m): tr_im_dataframe.at[i, m] for m in R_m for i in P_i}
 
-    classification_times = {
-        order: sum(tr_im[order, sku] for sku in R_m if rp_im.get((order, sku), 0) == 1)
-        for order in P_i
-    }
+    return Z_j, S_k, R_m, v, s_jk, d_jk
+
+def orders_from_line_items(line_items: Iterable[Tuple[str, str, float]], R_m: List[str]) -> Tuple[List[str], SparseOrderSku, Dict[str, float]]:
+    """
+    Orders given as (order, sku, time) line items, e.g. read from a database instead of a workbook.
+    The orders are listed in order of first appearance.
+    Returns (P_i, rp_im, classification_times), as load_orders.
+    """
+    sku_index = {sku: m for m, sku in enumerate(R_m)}
+    order_index = {}
+    rows, columns, times = [], [], []
+    for order, sku, time in line_items:
+        if sku not in sku_index:
+            raise ValueError(f"Unknown SKU '{sku}' in the line items of order '{order}'.")
+        rows.append(order_index.setdefault(order, len(order_index)))
+        columns.append(sku_index[sku])
+        times.append(time)
+
+    P_i = list(order_index)
+    rows = np.array(rows, dtype=np.int64)
+    rp_im = SparseOrderSku.from_triplets(P_i, R_m, rows, np.array(columns, dtype=np.int32), np.ones(len(rows), dtype=np.int8))
+    classification_times = dict(zip(P_i, np.bincount(rows, weights=np.array(times, dtype=np.float64), minlength=len(P_i)).tolist()))
+
+    return P_i, rp_im, classification_times
+
+def load_orders(path: str, R_m: List[str]) -> Tuple[List[str], SparseOrderSku, Dict[str, float]]:
+    """
+    Load the orders of a workbook with the SKUs R_m of a layout: the Pedidos sheet and the
+    line items (see _read_line_items). The workbook needs no layout sheets, so the waves
+    solved on a layout only carry their orders.
+    Returns (P_i, rp_im, classification_times).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        P_i = [row[0] for row in workbook['Pedidos'].iter_rows(min_row=2, max_col=1, values_only=True) if row[0] is not None]
+        try:
+            rows, columns, times = _read_line_items(workbook, P_i, R_m)
+        except KeyError as error:
+            raise ValueError(f"Unknown order or SKU {error} in the line items of '{path}'.") from None
+    finally:
+        workbook.close()
+
+    rp_im = SparseOrderSku.from_triplets(P_i, R_m, rows, columns, np.ones(len(rows), dtype=np.int8))
+    classification_times = dict(zip(P_i, np.bincount(rows, weights=times, minlength=len(P_i)).tolist()))
+
+    return P_i, rp_im, classification_times
+
+def load_data(instance_name: str) -> Tuple[
+        List[str],
+        List[str],
+        List[str],
+        List[str],
+        float,
+        Dict[Tuple[str, str], int],
+        SparseOrderSku,
+        Dict[Tuple[str, str], float],
+        Dict[str, float]
+    ]:
+    """
+    Load data from an Excel file containing the instance model: its layout (see load_layout)
+    and its orders (see load_orders). The order x SKU sheets are streamed into a sparse rp_im
+    (see SparseOrderSku).
+    """
+    Z_j, S_k, R_m, v, s_jk, d_jk = load_layout(instance_name)
+    P_i, rp_im, classification_times = load_orders(f'shared/instances_ptl/{instance_name}', R_m)
 
-    return P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
\ No newline at end of file
+    return P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
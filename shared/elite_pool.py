@@ -0,0 +1,132 @@
+import hashlib
+from itertools import permutations
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from shared.solution import Solution, bottleneck_descent
+
+def solution_hash(solution: Solution) -> bytes:
+    """
+    Digest of the order -> exit assignment of a solution.
+    """
+    return hashlib.blake2b(solution.order_exit.tobytes(), digest_size=16).digest()
+
+def solution_distance(solution: Solution, other: Solution) -> int:
+    """
+    Number of orders assigned to different exits.
+    """
+    return int(np.count_nonzero(solution.order_exit != other.order_exit))
+
+class ElitePool:
+    """
+    Top-k diverse solutions of an instance, ordered by Wmax.
+    - Duplicates are rejected by the hash of their order -> exit assignment.
+    - When the pool is full, a new solution must beat the worst elite, and it replaces the most
+      similar elite among the ones it beats, so the pool does not collapse around one solution.
+    """
+
+    def __init__(self, size: int = 10):
+        self.size = size
+        self.solutions: List[Solution] = []
+        self.hashes = set()
+
+    def add(self, solution: Solution) -> bool:
+        """
+        Try to insert a solution; returns whether it entered the pool.
+        """
+        digest = solution_hash(solution)
+        if digest in self.hashes:
+            return False
+
+        wmax = solution.wmax
+        if len(self.solutions) >= self.size:
+            worse = [elite for elite in self.solutions if elite.wmax > wmax]
+            if not worse:
+                return False
+            replaced = min(worse, key=lambda elite: solution_distance(solution, elite))
+            self.solutions.remove(replaced)
+            self.hashes.discard(solution_hash(replaced))
+
+        self.solutions.append(solution)
+        self.solutions.sort(key=lambda elite: elite.wmax)
+        self.hashes.add(digest)
+        return True
+
+    @property
+    def best(self) -> Optional[Solution]:
+        return self.solutions[0] if self.solutions else None
+
+    def __len__(self) -> int:
+        return len(self.solutions)
+
+    def __iter__(self) -> Iterator[Solution]:
+        return iter(list(self.solutions))
+
+def path_relinking(
+        initiating: Solution,
+        guiding: Solution,
+        travel: np.ndarray,
+        times: np.ndarray,
+        num_skus: np.ndarray
+    ) -> Optional[Solution]:
+    """
+    Greedy path relinking from the initiating to the guiding solution.
+    - Each step moves one order to its exit in the guiding solution, swapping it with the order
+      at that exit; the move with the lowest resulting Wmax is applied.
+    - Candidate moves are evaluated at once with incremental load updates (only the zones of the
+      two exits involved change).
+    Returns the best intermediate solution of the path (endpoints excluded), or None if the
+    solutions are at most one swap apart.
+    """
+    current = initiating.copy()
+    exit_zone = current.exit_zone
+    best = None
+    best_wmax = float('inf')
+
+    while True:
+        orders = np.flatnonzero(current.order_exit != guiding.order_exit)
+        if orders.size <= 2:  # The last swap reaches the guiding solution
+            return best
+
+        old_exits = current.order_exit[orders]
+        new_exits = guiding.order_exit[orders]
+        occupants = current.exit_order[new_exits]
+        occupied = occupants >= 0
+        occupant_index = np.where(occupied, occupants, 0)
+
+        order_cost = times[orders] + num_skus[orders] * travel[new_exits]
+        occupant_cost = np.where(occupied, times[occupant_index] + num_skus[occupant_index] * travel[old_exits], 0.0)
+        occupant_old_cost = np.where(occupied, current.order_cost[occupant_index], 0.0)
+
+        candidate_loads = np.tile(current.zone_load, (orders.size, 1))
+        rows = np.arange(orders.size)
+        np.add.at(candidate_loads, (rows, exit_zone[old_exits]), occupant_cost - current.order_cost[orders])
+        np.add.at(candidate_loads, (rows, exit_zone[new_exits]), order_cost - occupant_old_cost)
+        candidate_wmax = candidate_loads.max(axis=1)
+
+        move = int(np.argmin(candidate_wmax))
+        current.apply_move(int(orders[move]), int(new_exits[move]), travel, times, num_skus)
+        if candidate_wmax[move] < best_wmax:
+            best = current.copy()
+            best_wmax = best.wmax
+
+def relink_pool(
+        pool: ElitePool,
+        travel: np.ndarray,
+        times: np.ndarray,
+        num_skus: np.ndarray,
+        local_search_moves: int = 20
+    ) -> Solution:
+    """
+    Relinks every ordered pair of elite solutions, improves the best intermediate solution of
+    each path with bottleneck_descent and offers it to the pool.
+    Returns the best solution of the pool afterwards.
+    """
+    for initiating, guiding in permutations(list(pool), 2):
+        relinked = path_relinking(initiating, guiding, travel, times, num_skus)
+        if relinked is None:
+            continue
+        bottleneck_descent(relinked, travel, times, num_skus, local_search_moves)
+        pool.add(relinked)
+    return pool.best
@@ -0,0 +1,66 @@
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional
+
+from shared.utils import verify_solution
+from shared.result_cache import ResultCache
+from shared.solution import Solution, exit_zones, instance_arrays
+from shared.elite_pool import ElitePool, relink_pool
+from ptl.runner import load_instance, run_job
+
+def get_replicates(
+        instance: str,
+        method_name: str,
+        parameters: Dict[str, Any],
+        seeds: Iterable[int],
+        executor: Optional[Executor] = None,
+        cache: Optional[ResultCache] = None,
+        keep_solutions: bool = False
+    ) -> List[Dict[str, Any]]:
+    """
+    Metrics (wmax, wmax_wmin, execution_time) of one seeded run per seed.
+    - Runs stored in the result cache are reused; only the missing seeds are solved.
+    - Runs are solved in the executor when one is given.
+    - With keep_solutions, each replicate also holds its assignment as a compact Solution.
+    - Every replicate, including cached ones, is checked with the full verify_solution by run_job.
+    """
+    cache = cache or ResultCache()
+    if keep_solutions:
+        P_i, Z_j, S_k, _, _, s_jk, _, _, _ = load_instance(instance)
+        exit_zone = exit_zones(Z_j, S_k, s_jk)
+        P_i, Z_j, S_k = tuple(P_i), tuple(Z_j), tuple(S_k)  # Shared by every replicate solution
+    seeds = list(seeds)
+    job_arguments = (repeat(instance), repeat(method_name), repeat(parameters), seeds, repeat(None), repeat(False), repeat(cache))
+    results = executor.map(run_job, *job_arguments) if executor else map(run_job, *job_arguments)
+
+    replicates = []
+    for result, _ in results:
+        assignments, load_zones, execution_time = result[:3]
+        wmax = max(load_zones.values())
+        replicate = {
+            'wmax': float(wmax),
+            'wmax_wmin': float(wmax - min(load_zones.values())),
+            'execution_time': execution_time
+        }
+        if keep_solutions:
+            replicate['solution'] = Solution.from_assignments(assignments, load_zones, P_i, Z_j, S_k, exit_zone)
+        replicates.append(replicate)
+    return replicates
+
+def combine_replicates(instance: str, replicates: List[Dict[str, Any]], pool_size: int = 10, local_search_moves: int = 20) -> Solution:
+    """
+    Combines the solutions of replicates obtained with keep_solutions=True:
+    - Keeps the pool_size best diverse solutions in an ElitePool.
+    - Path relinks every pair of elite solutions (see relink_pool).
+    Returns the best solution found, checked with the full verify_solution.
+    """
+    args = load_instance(instance)
+    num_skus, times, travel, _, _ = instance_arrays(*args)
+
+    pool = ElitePool(pool_size)
+    for replicate in replicates:
+        pool.add(replicate['solution'])
+    best = relink_pool(pool, travel, times, num_skus, local_search_moves)
+
+    verify_solution(*best.to_assignments(), *args)
+    return best
@@ -1,18 +1,115 @@
 import os
+import json
+import hashlib
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from openpyxl import load_workbook
-from typing import List, Tuple, Dict
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Optional
 
-def generate_report(data_list: List[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str]], method: str) -> None:
+from shared.search_stats import SearchStats
+
+CHART_HASHES_FILE = 'chart_hashes.json'
+COLLAGE_HASH_KEY = '__collage__'
+
+def _pyplot():
+    """
+    Import pyplot lazily so importing this module does not load matplotlib.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Headless backend: reports are always written to files
+    import matplotlib.pyplot as plt
+    return plt
+
+def _chart_hash(instance_name: str, method_names: List[str], load_zones_list: List[Dict[str, float]]) -> str:
+    """
+    Hash of the data drawn in an instance chart, used to skip unchanged charts.
+    """
+    payload = json.dumps([
+        instance_name,
+        method_names,
+        [[(zone, float(load)) for zone, load in load_zones.items()] for load_zones in load_zones_list]
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _load_chart_hashes(hashes_file: str) -> Dict[str, str]:
+    try:
+        with open(hashes_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _draw_instance_chart(ax, instance_name: str, method_names: List[str], load_zones_list: List[Dict[str, float]]) -> None:
+    """
+    Draw the grouped bar chart of zone loads for one instance on the given axes.
+    """
+    plt = _pyplot()
+    colors = plt.cm.cividis(np.linspace(0, 1, len(method_names)))
+    bar_width = 0.2
+    zones = list(load_zones_list[0].keys())
+    index = np.arange(len(zones))
+
+    for i, (load_zones, method_name) in enumerate(zip(load_zones_list, method_names)):
+        bars = ax.bar(index + i * bar_width, list(load_zones.values()), bar_width, label=method_name, color=colors[i])
+        brightness = (0.299 * colors[i][0] + 0.587 * colors[i][1] + 0.114 * colors[i][2])
+        text_color = 'white' if brightness < 0.5 else 'black'
+        # One label call per method: all its bars share the same color
+        ax.bar_label(
+            bars,
+            labels=[method_name] * len(bars),
+            label_type='center',
+            rotation='vertical',
+            fontsize=12,
+            color=text_color
+        )
+
+    ax.set_xlabel('Zones', fontsize=18)
+    ax.set_ylabel('Time [s]', fontsize=18)
+    ax.set_title(f'{instance_name} - Comparison of Methods', fontsize=20)
+    ax.set_xticks(index + bar_width * (len(method_names) - 1) / 2)
+    ax.set_xticklabels(zones, fontsize=16)
+    ax.tick_params(axis='y', labelsize=16)
+
+def _render_instance_chart(image_path: str, instance_name: str, method_names: List[str], load_zones_list: List[Dict[str, float]]) -> str:
+    """
+    Render a single instance chart to image_path. Runs inside the process pool.
+    """
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    _draw_instance_chart(ax, instance_name, method_names, load_zones_list)
+    fig.tight_layout()
+    fig.savefig(image_path)
+    plt.close(fig)
+    return image_path
+
+def _render_collage(collage_path: str, charts: List[Tuple[str, List[str], List[Dict[str, float]]]], columns: int = 2) -> None:
+    """
+    Draw every instance chart as one multi-axes figure with the given number of columns.
+    """
+    plt = _pyplot()
+    rows = int(np.ceil(len(charts) / columns))
+    fig, axes = plt.subplots(rows, columns, figsize=(10 * columns, 6 * rows), squeeze=False)
+
+    for ax, (instance_name, method_names, load_zones_list) in zip(axes.flat, charts):
+        _draw_instance_chart(ax, instance_name, method_names, load_zones_list)
+
+    for ax in axes.flat[len(charts):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(collage_path, facecolor='white')
+    plt.close(fig)
+
+def generate_report(data_list: List[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, str, str]], method: str, max_workers: Optional[int] = None) -> None:
     """
     Generate a report in Excel with the given data.
     data_list: List of tuples (assignments, load_zones, execution_time, instance_name, method_name)
+    - Instance charts are rendered in a process pool (max_workers processes).
+    - Charts whose data has not changed since the last run are not redrawn.
     """
+    import pandas as pd
+    from openpyxl import load_workbook
+
     report_data = []
-    image_paths = []
+    charts = []
 
     # Group data by instance_name
     grouped_data = {}
@@ -45,44 +142,7 @@ def generate_report(data_list: List[Tuple[Dict[str, Tuple[str, str, float]], Dic
                 'Execution Time': execution_time
             })
 
-        # Generate bar chart for load_zones with multiple methods
-        plt.figure(figsize=(10, 6))
-        colors = plt.cm.cividis(np.linspace(0, 1, len(method_names)))
-        bar_width = 0.2
-        index = np.arange(len(load_zones_list[0]))
-
-        for i, (load_zones, method_name) in enumerate(zip(load_zones_list, method_names)):
-            bars = plt.bar(index + i * bar_width, load_zones.values(), bar_width, label=method_name, color=colors[i])
-            for bar in bars:
-                height = bar.get_height()
-                color = bar.get_facecolor()
-                brightness = (0.299 * color[0] + 0.587 * color[1] + 0.114 * color[2])
-                text_color = 'white' if brightness < 0.5 else 'black'
-                plt.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height / 2,
-                    method_name,
-                    ha='center',
-                    va='center',
-                    rotation='vertical',
-                    fontsize=12,
-                    color=text_color
-                )
-
-        plt.xlabel('Zones', fontsize=18)
-        plt.ylabel('Time [s]', fontsize=18)
-        plt.title(f'{instance_name} - Comparison of Methods', fontsize=20)
-        plt.xticks(index + bar_width * (len(method_names) - 1) / 2, load_zones.keys(), fontsize=16)
-        plt.yticks(fontsize=16)
-        plt.tight_layout()
-
-        # Save the plot as an image
-        output_dir = f'{method}_method/reports/bar_images'
-        os.makedirs(output_dir, exist_ok=True)
-        image_path = f'{output_dir}/{instance_name}_comparison.png'
-        plt.savefig(image_path)
-        plt.close()
-        image_paths.append(image_path)
+        charts.append((instance_name, method_names, load_zones_list))
 
     df = pd.DataFrame(report_data)
     output_dir = f'{method}_method/reports'
@@ -110,26 +170,67 @@ def generate_report(data_list: List[Tuple[Dict[str, Tuple[str, str, float]], Dic
 
     workbook.save(output_file)
 
+    # Only redraw the charts whose input data changed since the last run
+    images_dir = f'{output_dir}/bar_images'
+    os.makedirs(images_dir, exist_ok=True)
+    hashes_file = f'{images_dir}/{CHART_HASHES_FILE}'
+    previous_hashes = _load_chart_hashes(hashes_file)
+    current_hashes = {}
+    pending_charts = []
+
+    for instance_name, method_names, load_zones_list in charts:
+        image_path = f'{images_dir}/{instance_name}_comparison.png'
+        chart_hash = _chart_hash(instance_name, method_names, load_zones_list)
+        current_hashes[instance_name] = chart_hash
+        if previous_hashes.get(instance_name) != chart_hash or not os.path.exists(image_path):
+            pending_charts.append((image_path, instance_name, method_names, load_zones_list))
+
+    if len(pending_charts) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_render_instance_chart, *zip(*pending_charts)))
+    elif pending_charts:
+        _render_instance_chart(*pending_charts[0])
+
     # Create a collage with 2 columns per row
-    images = [Image.open(image_path) for image_path in image_paths]
-    num_images = len(images)
-    columns = 2
-    rows = int(np.ceil(num_images / columns))
-    max_width = max(img.width for img in images)
-    max_height = max(img.height for img in images)
-
-    collage_width = columns * max_width
-    collage_height = rows * max_height
-
-    collage = Image.new('RGB', (collage_width, collage_height), (255, 255, 255))
-
-    x_offset = 0
-    y_offset = 0
-    for i, img in enumerate(images):
-        collage.paste(img, (x_offset, y_offset))
-        x_offset += max_width
-        if (i + 1) % columns == 0:
-            x_offset = 0
-            y_offset += max_height
-
-    collage.save(f'{output_dir}/comparison_workload_balancing_bar_chart.png')
\ No newline at end of file
+    collage_path = f'{output_dir}/comparison_workload_balancing_bar_chart.png'
+    collage_hash = hashlib.sha256(''.join(current_hashes[chart[0]] for chart in charts).encode('utf-8')).hexdigest()
+    current_hashes[COLLAGE_HASH_KEY] = collage_hash
+    if previous_hashes.get(COLLAGE_HASH_KEY) != collage_hash or not os.path.exists(collage_path):
+        _render_collage(collage_path, charts)
+
+    previous_hashes.update(current_hashes)
+    with open(hashes_file, 'w', encoding='utf-8') as file:
+        json.dump(previous_hashes, file, indent=2)
+
+def generate_convergence_report(stats_list: List[Tuple[SearchStats, str, str]], method: str) -> None:
+    """
+    Plot the Wmax improvement trajectory of each run, one chart per instance.
+    stats_list: List of tuples (stats, instance_name, method_name)
+    """
+    plt = _pyplot()
+
+    grouped_stats = {}
+    for stats, instance_name, method_name in stats_list:
+        grouped_stats.setdefault(instance_name, []).append((stats, method_name))
+
+    output_dir = f'{method}_method/reports/convergence'
+    os.makedirs(output_dir, exist_ok=True)
+
+    for instance_name, methods_stats in grouped_stats.items():
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for stats, method_name in methods_stats:
+            times = [point[0] for point in stats.trajectory]
+            wmax_values = [point[1] for point in stats.trajectory]
+            # Extend the last value to the end of the run so curves of different lengths compare visually
+            times.append(stats.initial_phase_time + stats.improvement_phase_time)
+            wmax_values.append(wmax_values[-1])
+            ax.step(times, wmax_values, where='post', label=method_name)
+
+        ax.set_xlabel('Time [s]', fontsize=18)
+        ax.set_ylabel('Wmax [s]', fontsize=18)
+        ax.set_title(f'{instance_name} - Convergence', fontsize=20)
+        ax.tick_params(labelsize=16)
+        ax.legend(fontsize=14)
+        fig.tight_layout()
+        fig.savefig(f'{output_dir}/{instance_name}_convergence.png')
+        plt.close(fig)
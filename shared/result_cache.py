@@ -0,0 +1,159 @@
+import os
+import re
+import json
+import hashlib
+import inspect
+import importlib
+from typing import Any, Dict, Optional, Tuple
+
+# Bump when the layout of the cache entries changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = '.ptl_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Number of writes between two size checks of the cache folder
+EVICTION_INTERVAL = 64
+
+# Entries are stored as <first two characters of the key>/<key>.json
+ENTRY_PATTERN = re.compile(r'([0-9a-f]{2})/\1[0-9a-f]{62}\.json')
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INSTANCES_DIR = 'shared/instances_ptl'
+
+_instance_hashes = {}
+_code_versions = {}
+
+# Writes per cache folder in this process. Kept at module level because worker
+# processes receive a fresh pickled copy of the cache with every job.
+_writes_since_eviction = {}
+
+def instance_hash(instance: str) -> str:
+    """
+    SHA-256 of the instance file contents, memoized per file size and modification time.
+    """
+    path = f'{INSTANCES_DIR}/{instance}'
+    status = os.stat(path)
+    memo_key = (path, status.st_size, status.st_mtime_ns)
+    if memo_key not in _instance_hashes:
+        with open(path, 'rb') as file:
+            _instance_hashes[memo_key] = hashlib.sha256(file.read()).hexdigest()
+    return _instance_hashes[memo_key]
+
+def _project_modules(module, seen: Dict[str, Any]) -> None:
+    """
+    Collect the project modules a module depends on through its globals.
+    """
+    seen[module.__name__] = module
+    for value in vars(module).values():
+        dependency = value if inspect.ismodule(value) else inspect.getmodule(value)
+        if dependency is None or dependency.__name__ in seen:
+            continue
+        module_file = getattr(dependency, '__file__', None)
+        if module_file and os.path.abspath(module_file).startswith(PROJECT_ROOT):
+            _project_modules(dependency, seen)
+
+def code_version(module_name: str) -> str:
+    """
+    Hash of the source of a heuristics module and of the project modules it uses,
+    so editing one method only invalidates the runs that depend on it.
+    """
+    if module_name not in _code_versions:
+        modules = {}
+        _project_modules(importlib.import_module(module_name), modules)
+        digest = hashlib.sha256()
+        for name in sorted(modules):
+            with open(modules[name].__file__, 'rb') as file:
+                digest.update(name.encode('utf-8'))
+                digest.update(file.read())
+        _code_versions[module_name] = digest.hexdigest()
+    return _code_versions[module_name]
+
+class ResultCache:
+    """
+    Persistent on-disk cache of seeded heuristic runs.
+    - Entries are keyed by (instance content hash, method, parameters, seed, code version).
+    - Writes go to a temporary file that is renamed into place, so parallel jobs can share the cache.
+    - The least recently used entries are evicted once the folder exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, instance: str, method_name: str, module_name: str, parameters: Dict[str, Any], seed: int) -> str:
+        payload = json.dumps({
+            'format': CACHE_FORMAT_VERSION,
+            'instance': instance_hash(instance),
+            'method': method_name,
+            'parameters': parameters,
+            'seed': seed,
+            'code': code_version(module_name)
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return f'{self.directory}/{key[:2]}/{key}.json'
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float]]:
+        """
+        Stored (assignments, load_zones, execution_time) for key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            os.utime(path)  # The modification time tracks the last use for the LRU eviction
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        assignments = {order: (zone, exit_, classification_time) for order, zone, exit_, classification_time in entry['assignments']}
+        return assignments, entry['load_zones'], entry['execution_time']
+
+    def put(self, key: str, assignments: Dict[str, Tuple[str, str, float]], load_zones: Dict[str, float], execution_time: float) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'assignments': [[order, zone, exit_, float(classification_time)] for order, (zone, exit_, classification_time) in assignments.items()],
+            'load_zones': {zone: float(load) for zone, load in load_zones.items()},
+            'execution_time': execution_time
+        }
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(temporary_path, path)
+
+        _writes_since_eviction[self.directory] = _writes_since_eviction.get(self.directory, 0) + 1
+        if _writes_since_eviction[self.directory] >= EVICTION_INTERVAL:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache fits in max_bytes.
+        Only <xx>/<key>.json entries are considered, so other files in the folder are kept.
+        Entries removed concurrently by another process are skipped.
+        """
+        _writes_since_eviction[self.directory] = 0
+        entries = []
+        total_bytes = 0
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                if not ENTRY_PATTERN.fullmatch(os.path.relpath(path, self.directory).replace(os.sep, '/')):
+                    continue
+                try:
+                    status = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+                total_bytes += status.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+@dataclass
+class SearchStats:
+    """
+    Counters returned by the search methods when they are called with collect_stats=True.
+    - trajectory holds (seconds since start, Wmax) each time the best solution improves.
+    """
+    moves_proposed: int = 0
+    moves_accepted: int = 0
+    evaluations: int = 0
+    initial_phase_time: float = 0.0
+    improvement_phase_time: float = 0.0
+    trajectory: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def evaluations_per_second(self) -> float:
+        return self.evaluations / self.improvement_phase_time if self.improvement_phase_time > 0 else 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.moves_accepted / self.moves_proposed if self.moves_proposed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.moves_accepted}/{self.moves_proposed} moves accepted, "
+            f"{self.evaluations_per_second:.0f} evaluations/s, "
+            f"initial phase {self.initial_phase_time:.4f} s, "
+            f"improvement phase {self.improvement_phase_time:.4f} s"
+        )
@@ -0,0 +1,237 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from shared.utils import sku_count
+
+FREE_EXIT = -1
+
+# exit_zones of the last layouts, memoized so the waves solved on a layout index it once
+_exit_zones = {}
+
+def exit_zones(Z_j: List[str], S_k: List[str], s_jk: Dict[Tuple[str, str], int]) -> np.ndarray:
+    """
+    Index in Z_j of the zone each exit of S_k belongs to (s_jk[zone, exit] == 1).
+    The array is shared by the calls with the same layout and is read-only.
+    """
+    memo_key = (id(s_jk), tuple(Z_j), tuple(S_k))
+    if memo_key not in _exit_zones:
+        exit_zone = np.full(len(S_k), FREE_EXIT, dtype=np.int32)
+        for j, zone in enumerate(Z_j):
+            for k, exit_ in enumerate(S_k):
+                if s_jk.get((zone, exit_), 0) == 1:
+                    exit_zone[k] = j
+        exit_zone.flags.writeable = False
+        if len(_exit_zones) >= 8:
+            _exit_zones.clear()
+        # s_jk is kept alive with the array so its id is not reused
+        _exit_zones[memo_key] = (s_jk, exit_zone)
+    return _exit_zones[memo_key][1]
+
+def instance_arrays(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    Arrays of an instance used by the array-based methods, indexed like P_i, S_k and Z_j:
+    (SKU count per order, classification time per order, round trip time per SKU of each exit,
+    zone of each exit, exits of each zone from the nearest to the farthest).
+    """
+    exit_zone = exit_zones(Z_j, S_k, s_jk)
+    num_skus = np.array([sku_count(order, R_m, rp_im) for order in P_i], dtype=np.float64)
+    times = np.array([classification_times[order] for order in P_i], dtype=np.float64)
+    travel = np.array([2 * d_jk[Z_j[exit_zone[k]], exit_] / v if exit_zone[k] >= 0 else np.inf for k, exit_ in enumerate(S_k)])
+    zone_exits = [exits[np.argsort(travel[exits], kind='stable')] for exits in (np.flatnonzero(exit_zone == zone) for zone in range(len(Z_j)))]
+    return num_skus, times, travel, exit_zone, zone_exits
+
+class Solution:
+    """
+    Compact array-backed solution of a PTL instance.
+    - order_exit[i]: index in S_k of the exit assigned to order P_i[i].
+    - exit_order[k]: index in P_i of the order assigned to exit S_k[k], FREE_EXIT if unused.
+    - order_cost[i]: classification time of order P_i[i] at its exit.
+    - zone_load[j]: workload of zone Z_j[j].
+    P_i, Z_j, S_k and exit_zone are shared between the solutions of an instance and never copied.
+    """
+
+    __slots__ = ('P_i', 'Z_j', 'S_k', 'exit_zone', 'order_exit', 'exit_order', 'order_cost', 'zone_load')
+
+    def __init__(
+            self,
+            P_i: Sequence[str],
+            Z_j: Sequence[str],
+            S_k: Sequence[str],
+            exit_zone: np.ndarray,
+            order_exit: np.ndarray,
+            exit_order: np.ndarray,
+            order_cost: np.ndarray,
+            zone_load: np.ndarray
+        ):
+        self.P_i = P_i
+        self.Z_j = Z_j
+        self.S_k = S_k
+        self.exit_zone = exit_zone
+        self.order_exit = order_exit
+        self.exit_order = exit_order
+        self.order_cost = order_cost
+        self.zone_load = zone_load
+
+    @classmethod
+    def from_assignments(
+            cls,
+            assignments: Dict[str, Tuple[str, str, float]],
+            load_zones: Dict[str, float],
+            P_i: Sequence[str],
+            Z_j: Sequence[str],
+            S_k: Sequence[str],
+            exit_zone: Optional[np.ndarray] = None
+        ) -> 'Solution':
+        """
+        Build a Solution from the legacy {order: (zone, exit, classification_time)} form.
+        Without exit_zone (see exit_zones), the zones of unused exits are unknown (FREE_EXIT).
+        """
+        P_i, Z_j, S_k = tuple(P_i), tuple(Z_j), tuple(S_k)
+        order_index = {order: i for i, order in enumerate(P_i)}
+        zone_index = {zone: j for j, zone in enumerate(Z_j)}
+        exit_index = {exit_: k for k, exit_ in enumerate(S_k)}
+
+        order_exit = np.empty(len(P_i), dtype=np.int32)
+        exit_order = np.full(len(S_k), FREE_EXIT, dtype=np.int32)
+        order_cost = np.empty(len(P_i), dtype=np.float64)
+        if exit_zone is None:
+            exit_zone = np.full(len(S_k), FREE_EXIT, dtype=np.int32)
+            fill_exit_zone = True
+        else:
+            fill_exit_zone = False
+
+        for order, (zone, exit_, classification_time) in assignments.items():
+            i, k = order_index[order], exit_index[exit_]
+            order_exit[i] = k
+            exit_order[k] = i
+            order_cost[i] = classification_time
+            if fill_exit_zone:
+                exit_zone[k] = zone_index[zone]
+
+        zone_load = np.array([load_zones[zone] for zone in Z_j], dtype=np.float64)
+
+        return cls(P_i, Z_j, S_k, exit_zone, order_exit, exit_order, order_cost, zone_load)
+
+    def to_assignments(self) -> Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float]]:
+        """
+        Convert back to the legacy (assignments, load_zones) dictionaries.
+        """
+        assignments = {
+            order: (self.Z_j[self.exit_zone[k]], self.S_k[k], float(cost))
+            for order, k, cost in zip(self.P_i, self.order_exit.tolist(), self.order_cost)
+        }
+        load_zones = dict(zip(self.Z_j, self.zone_load.tolist()))
+        return assignments, load_zones
+
+    def apply_move(self, order: int, exit_: int, travel: np.ndarray, times: np.ndarray, num_skus: np.ndarray) -> Tuple[int, int]:
+        """
+        Move an order to an exit, swapping it with the order at that exit if the exit is taken.
+        Costs and loads are updated incrementally. Returns (exit the order left, swapped order or FREE_EXIT).
+        """
+        exit_zone = self.exit_zone
+        old_exit = int(self.order_exit[order])
+        other_order = int(self.exit_order[exit_])
+        self.zone_load[exit_zone[old_exit]] -= self.order_cost[order]
+        self.order_cost[order] = times[order] + num_skus[order] * travel[exit_]
+        self.zone_load[exit_zone[exit_]] += self.order_cost[order]
+        self.order_exit[order] = exit_
+        self.exit_order[exit_] = order
+        self.exit_order[old_exit] = other_order
+        if other_order >= 0:
+            self.zone_load[exit_zone[exit_]] -= self.order_cost[other_order]
+            self.order_cost[other_order] = times[other_order] + num_skus[other_order] * travel[old_exit]
+            self.zone_load[exit_zone[old_exit]] += self.order_cost[other_order]
+            self.order_exit[other_order] = old_exit
+        return old_exit, other_order
+
+    def copy(self) -> 'Solution':
+        return Solution(
+            self.P_i, self.Z_j, self.S_k, self.exit_zone,
+            self.order_exit.copy(), self.exit_order.copy(), self.order_cost.copy(), self.zone_load.copy()
+        )
+
+    @property
+    def wmax(self) -> float:
+        return float(self.zone_load.max())
+
+    @property
+    def wmax_wmin(self) -> float:
+        return float(self.zone_load.max() - self.zone_load.min())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the per-solution buffers.
+        """
+        return self.order_exit.nbytes + self.exit_order.nbytes + self.order_cost.nbytes + self.zone_load.nbytes
+
+def evaluate_bottleneck_moves(
+        solution: Solution,
+        bottleneck: int,
+        travel: np.ndarray,
+        times: np.ndarray,
+        num_skus: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moves of an order of the bottleneck zone to any other exit (candidate list of the tabu search).
+    If the target exit is taken, the two orders swap exits.
+    Returns (orders, exits, new Wmax matrix of shape orders x exits), computed with incremental load updates.
+    """
+    exit_zone = solution.exit_zone
+    zone_load = solution.zone_load
+    orders = np.flatnonzero(exit_zone[solution.order_exit] == bottleneck)
+    exits = np.arange(len(exit_zone))
+
+    order_exit = solution.order_exit[orders]
+    target_zone = exit_zone[exits]
+    occupant = solution.exit_order[exits]
+    occupied = occupant >= 0
+    occupant_index = np.where(occupied, occupant, 0)
+
+    # Order leaving the bottleneck zone, and the occupant of the target exit moving in (if any)
+    cost_out = solution.order_cost[orders][:, None]
+    cost_in = np.where(occupied[None, :], times[occupant_index][None, :] + num_skus[occupant_index][None, :] * travel[order_exit][:, None], 0.0)
+    # Order entering the target zone, and the occupant leaving it
+    cost_enter = times[orders][:, None] + num_skus[orders][:, None] * travel[exits][None, :]
+    cost_leave = np.where(occupied, solution.order_cost[occupant_index], 0.0)[None, :]
+
+    same_zone = (target_zone == bottleneck)[None, :]
+    bottleneck_load = zone_load[bottleneck] - cost_out + cost_in + np.where(same_zone, cost_enter - cost_leave, 0.0)
+    target_load = np.where(same_zone, bottleneck_load, zone_load[target_zone][None, :] - cost_leave + cost_enter)
+
+    # Largest load among the zones the move does not touch
+    untouched_max = np.empty(len(zone_load))
+    for zone in range(len(zone_load)):
+        untouched = np.delete(zone_load, [bottleneck, zone])
+        untouched_max[zone] = untouched.max() if untouched.size else 0.0
+
+    new_wmax = np.maximum(np.maximum(bottleneck_load, target_load), untouched_max[target_zone][None, :])
+    new_wmax[order_exit[:, None] == exits[None, :]] = np.inf  # Staying at the same exit is not a move
+
+    return orders, exits, new_wmax
+
+def bottleneck_descent(solution: Solution, travel: np.ndarray, times: np.ndarray, num_skus: np.ndarray, max_moves: int) -> Tuple[int, int]:
+    """
+    Best improvement descent: applies up to max_moves moves or swaps of an order of the bottleneck
+    zone (see evaluate_bottleneck_moves) while they reduce Wmax.
+    Returns (moves evaluated, moves applied).
+    """
+    evaluations = 0
+    for applied in range(max_moves):
+        orders, exits, new_wmax = evaluate_bottleneck_moves(solution, int(np.argmax(solution.zone_load)), travel, times, num_skus)
+        evaluations += new_wmax.size
+        move = int(np.argmin(new_wmax))
+        if new_wmax.flat[move] >= solution.wmax - 1e-9:
+            return evaluations, applied
+        solution.apply_move(int(orders[move // len(exits)]), int(exits[move % len(exits)]), travel, times, num_skus)
+    return evaluations, max_moves
@@ -1,31 +1,146 @@
 import os
-import pandas as pd
-from typing import Dict, Tuple, List
+import numpy as np
+from typing import Dict, Tuple, List, Optional
+
+from shared.data_loader.data_loader import SparseOrderSku
 
 def evaluate_solution(load_zones: Dict[str, float]) -> Tuple[float, float]:
     max_load = max(load_zones.values())
     min_load = min(load_zones.values())
     return max_load, max_load - min_load
 
-def verify_solution(assignments: Dict[str, Tuple[str, str, float]], load_zones: Dict[str, float], P_i: List[str], Z_j: List[str], S_k: List[str]) -> bool:
+def sku_count(order: str, R_m: List[str], rp_im: Dict[Tuple[str, str], int]) -> int:
+    """
+    Number of SKUs of an order (rp_im[order, sku] == 1).
+    Read from the CSR row when rp_im is sparse (see load_data), instead of scanning every SKU.
+    """
+    if isinstance(rp_im, SparseOrderSku):
+        return rp_im.count_in_row(order)
+    return sum(1 for sku in R_m if rp_im.get((order, sku), 0) == 1)
+
+# Set PTL_DEBUG_VERIFY=1 to verify every accepted move inside the search loops
+DEBUG_VERIFY = os.environ.get('PTL_DEBUG_VERIFY', '') == '1'
+
+# Instance arrays used by verify_solution, memoized per layout and per order data dictionaries
+_layout_arrays = {}
+_instance_arrays = {}
+
+def _get_layout_arrays(
+        Z_j: List[str],
+        S_k: List[str],
+        s_jk: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (s_jk matrix, d_jk matrix), built once per layout so the waves solved on it share them.
+    """
+    memo_key = (id(s_jk), id(d_jk), tuple(Z_j), tuple(S_k))
+    if memo_key not in _layout_arrays:
+        s_matrix = np.array([[s_jk.get((zone, exit_), 0) == 1 for exit_ in S_k] for zone in Z_j], dtype=bool)
+        d_matrix = np.array([[d_jk.get((zone, exit_), 0.0) for exit_ in S_k] for zone in Z_j], dtype=np.float64)
+        if len(_layout_arrays) >= 8:
+            _layout_arrays.clear()
+        # The dictionaries are kept alive with the arrays so their ids are not reused
+        _layout_arrays[memo_key] = ((s_jk, d_jk), (s_matrix, d_matrix))
+    return _layout_arrays[memo_key][1]
+
+def _get_instance_arrays(
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float]
+    ) -> Tuple[Dict[str, int], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (order index, s_jk matrix, d_jk matrix, SKUs per order, classification times).
+    Built once per instance (the matrices once per layout), so verifying many replicates only pays for the checks.
+    """
+    s_matrix, d_matrix = _get_layout_arrays(Z_j, S_k, s_jk, d_jk)
+    memo_key = (id(rp_im), id(classification_times))
+    if memo_key not in _instance_arrays:
+        orders = list(classification_times)
+        num_skus = np.array([sku_count(order, R_m, rp_im) for order in orders], dtype=np.float64)
+        times = np.array([classification_times[order] for order in orders], dtype=np.float64)
+        if len(_instance_arrays) >= 8:
+            _instance_arrays.clear()
+        # The dictionaries are kept alive with the arrays so their ids are not reused
+        _instance_arrays[memo_key] = ((rp_im, classification_times), ({order: i for i, order in enumerate(orders)}, num_skus, times))
+    order_index, num_skus, times = _instance_arrays[memo_key][1]
+    return order_index, s_matrix, d_matrix, num_skus, times
+
+def verify_solution(
+        assignments: Dict[str, Tuple[str, str, float]],
+        load_zones: Dict[str, float],
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: Optional[List[str]] = None,
+        v: Optional[float] = None,
+        s_jk: Optional[Dict[Tuple[str, str], int]] = None,
+        rp_im: Optional[Dict[Tuple[str, str], int]] = None,
+        d_jk: Optional[Dict[Tuple[str, str], float]] = None,
+        classification_times: Optional[Dict[str, float]] = None,
+        tolerance: float = 1e-6
+    ) -> bool:
+    """
+    Verifies a solution with vectorized checks and raises ValueError on the first failure.
+    - Every order is assigned and no exit is used twice (bincount).
+    When the rest of the instance data is given (verify_solution(assignments, load_zones, *load_data(...))):
+    - Every exit belongs to its assigned zone under s_jk (gather).
+    - Classification times and zone loads match the ones recomputed from
+      classification_times and d_jk (scatter-add), within tolerance.
+    """
     if len(assignments) != len(P_i):
         raise ValueError("The number of assignments does not match the number of orders.")
-    
-    orders = list(assignments.keys())
-    assigned_exits = [assignment[1] for assignment in assignments.values()]
-     
-    if len(orders) != len(set(orders)):
-        raise ValueError("Duplicate zones found in assignments.")
-    
-    if len(assigned_exits) != len(set(assigned_exits)):
-        raise ValueError("Duplicate exits found in assignments.")
-    
+
+    if assignments.keys() != set(P_i):
+        raise ValueError("The assigned orders do not match the orders of the instance.")
+
     if len(load_zones) != len(Z_j):
         raise ValueError("The number of load zones does not match the number of zones.")
-    
+
+    zone_index = {zone: j for j, zone in enumerate(Z_j)}
+    exit_index = {exit_: k for k, exit_ in enumerate(S_k)}
+    try:
+        order_zone = np.fromiter((zone_index[assignment[0]] for assignment in assignments.values()), dtype=np.intp, count=len(assignments))
+        order_exit = np.fromiter((exit_index[assignment[1]] for assignment in assignments.values()), dtype=np.intp, count=len(assignments))
+        zone_load = np.fromiter((load_zones[zone] for zone in Z_j), dtype=np.float64, count=len(Z_j))
+    except KeyError as error:
+        raise ValueError(f"Unknown zone or exit {error} in the solution.") from None
+
+    if np.bincount(order_exit, minlength=len(S_k)).max(initial=0) > 1:
+        raise ValueError("Duplicate exits found in assignments.")
+
+    if any(data is None for data in (R_m, v, s_jk, rp_im, d_jk, classification_times)):
+        return True
+
+    order_index, s_matrix, d_matrix, num_skus, times = _get_instance_arrays(Z_j, S_k, R_m, s_jk, rp_im, d_jk, classification_times)
+    orders = np.fromiter((order_index[order] for order in assignments), dtype=np.intp, count=len(assignments))
+
+    misplaced = ~s_matrix[order_zone, order_exit]
+    if misplaced.any():
+        order = list(assignments)[int(np.argmax(misplaced))]
+        raise ValueError(f"Exit {assignments[order][1]} of order {order} does not belong to zone {assignments[order][0]}.")
+
+    order_cost = np.fromiter((assignment[2] for assignment in assignments.values()), dtype=np.float64, count=len(assignments))
+    expected_cost = times[orders] + num_skus[orders] * 2 * d_matrix[order_zone, order_exit] / v
+    wrong_cost = ~np.isclose(order_cost, expected_cost, rtol=0, atol=tolerance)
+    if wrong_cost.any():
+        order = list(assignments)[int(np.argmax(wrong_cost))]
+        raise ValueError(f"Classification time of order {order} does not match the instance data.")
+
+    expected_load = np.bincount(order_zone, weights=expected_cost, minlength=len(Z_j))
+    wrong_load = ~np.isclose(zone_load, expected_load, rtol=0, atol=tolerance * max(1, len(P_i)))
+    if wrong_load.any():
+        raise ValueError(f"Load of zone {Z_j[int(np.argmax(wrong_load))]} does not match the classification times of its orders.")
+
     return True
 
 def save_results(assignments: Dict[str, Tuple[str, str, float]], load_zones: Dict[str, float], filename: str, instance_name: str):
+    import pandas as pd  # Imported lazily: the solving path does not need pandas
+
     max_load_zone = max(load_zones, key=load_zones.get)
     resumen_df = pd.DataFrame({
         'Instancia': [instance_name],
@@ -0,0 +1,118 @@
+import time
+import numpy as np
+from typing import Callable, Dict, Tuple, List, Optional, Union
+
+from shared.utils import DEBUG_VERIFY, verify_solution
+from shared.search_stats import SearchStats
+from shared.solution import Solution, evaluate_bottleneck_moves, instance_arrays
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+
+def tabu_search(
+        P_i: List[str],
+        Z_j: List[str],
+        S_k: List[str],
+        R_m: List[str],
+        v: float,
+        s_jk: Dict[Tuple[str, str], int],
+        rp_im: Dict[Tuple[str, str], int],
+        d_jk: Dict[Tuple[str, str], float],
+        classification_times: Dict[str, float],
+        max_iterations: int = 1000,
+        max_no_improve: int = 200,
+        tabu_tenure: int = 10,
+        should_stop: Optional[Callable[[float], bool]] = None,
+        collect_stats: bool = False
+    ) -> Union[
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float],
+            Tuple[Dict[str, Tuple[str, str, float]], Dict[str, float], float, SearchStats]
+        ]:
+    """
+    Tabu search over exit moves and swaps:
+    - Starts with the deterministic nearest neighbor solution.
+    - Only examines moves of orders of the bottleneck zone (candidate list).
+    - Applies the best non-tabu move, even if it worsens Wmax.
+    - Moving an order back to an exit it left is tabu for tabu_tenure iterations,
+      stored in an (order, exit) array for O(1) lookup.
+    - A tabu move is allowed if it improves the best Wmax found (aspiration).
+    - Stops after max_iterations or max_no_improve iterations without improving the best Wmax.
+    - With should_stop, should_stop(best Wmax) is called once per iteration and the best solution
+      found so far is returned as soon as it returns True (e.g. at a deadline).
+    - With collect_stats=True, a SearchStats object is returned after the execution time.
+    """
+    start_time = time.time()
+
+    initial_assignments, initial_load_zones, _ = nearest_neighbor_minimize_max_workload_time(
+        P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times
+    )
+
+    num_skus, times, travel, exit_zone, _ = instance_arrays(P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+    current = Solution.from_assignments(initial_assignments, initial_load_zones, P_i, Z_j, S_k, exit_zone)
+    best = current.copy()
+    best_wmax = best.wmax
+
+    tabu_until = np.zeros((len(P_i), len(S_k)), dtype=np.int32)
+
+    stats = SearchStats() if collect_stats else None
+    initial_phase_end = time.time()
+    if stats is not None:
+        stats.trajectory.append((initial_phase_end - start_time, best_wmax))
+    moves_proposed = 0
+    moves_accepted = 0
+
+    no_improve_count = 0
+
+    for iteration in range(1, max_iterations + 1):
+        if no_improve_count >= max_no_improve:
+            break
+        if should_stop is not None and should_stop(best_wmax):
+            break
+
+        bottleneck = int(np.argmax(current.zone_load))
+        orders, exits, new_wmax = evaluate_bottleneck_moves(current, bottleneck, travel, times, num_skus)
+        moves_proposed += new_wmax.size
+
+        # A move is tabu if the order, or the order it swaps with, would go back to an exit it recently left
+        occupant = current.exit_order[exits]
+        tabu = tabu_until[orders[:, None], exits[None, :]] > iteration
+        swapped_back = tabu_until[np.where(occupant >= 0, occupant, 0)[None, :], current.order_exit[orders][:, None]] > iteration
+        tabu |= swapped_back & (occupant >= 0)[None, :]
+        admissible = np.where(tabu & (new_wmax >= best_wmax), np.inf, new_wmax)
+
+        move = int(np.argmin(admissible))
+        if not np.isfinite(admissible.flat[move]):
+            break
+        order, exit_ = int(orders[move // len(exits)]), int(exits[move % len(exits)])
+
+        # Apply the move (a swap when the target exit is taken)
+        old_exit, other_order = current.apply_move(order, exit_, travel, times, num_skus)
+        tabu_until[order, old_exit] = iteration + tabu_tenure
+        if other_order >= 0:
+            tabu_until[other_order, exit_] = iteration + tabu_tenure
+        moves_accepted += 1
+
+        current_wmax = current.wmax
+        if current_wmax < best_wmax:
+            best = current.copy()
+            best_wmax = current_wmax
+            no_improve_count = 0
+            if DEBUG_VERIFY:
+                verify_solution(*best.to_assignments(), P_i, Z_j, S_k, R_m, v, s_jk, rp_im, d_jk, classification_times)
+            if stats is not None:
+                stats.trajectory.append((time.time() - start_time, best_wmax))
+        else:
+            no_improve_count += 1
+
+    best_assignments, best_load_zones = best.to_assignments()
+
+    execution_time = time.time() - start_time
+
+    if stats is None:
+        return best_assignments, best_load_zones, execution_time
+
+    stats.moves_proposed = moves_proposed
+    stats.moves_accepted = moves_accepted
+    stats.evaluations = moves_proposed
+    stats.initial_phase_time = initial_phase_end - start_time
+    stats.improvement_phase_time = execution_time - stats.initial_phase_time
+
+    return best_assignments, best_load_zones, execution_time, stats
@@ -0,0 +1,8 @@
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The project reads its instances relative to the repository root, like the scripts do
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
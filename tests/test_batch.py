@@ -0,0 +1,35 @@
+import unittest
+
+from ptl.batch import BatchSolver
+from ptl.runner import run_job
+from shared.data_loader.data_loader import load_orders
+
+INSTANCE = '40_heterogeneous.xlsx'
+WAVE_PATH = f'shared/instances_ptl/{INSTANCE}'
+
+class BatchSolverTest(unittest.TestCase):
+    """
+    Waves solved on a shared layout give the same solutions as solving their instance on its own.
+    """
+
+    def test_waves_match_single_solves(self):
+        expected, _ = run_job(INSTANCE, 'lpt', {})
+        for workers in (1, 2):
+            with self.subTest(workers=workers), BatchSolver(INSTANCE, 'lpt', workers=workers) as solver:
+                wave = load_orders(WAVE_PATH, solver.R_m)
+                results = sorted(solver.solve([WAVE_PATH, ('wave_a', wave), ('wave_b', wave)]), key=lambda result: result[3])
+
+                self.assertEqual([result[3] for result in results], ['40_heterogeneous', 'wave_a', 'wave_b'])
+                for assignments, load_zones, _, _, method_name in results:
+                    self.assertEqual(method_name, 'lpt')
+                    self.assertEqual((assignments, load_zones), expected[:2])
+
+    def test_wave_with_more_orders_than_exits_is_rejected(self):
+        with BatchSolver(INSTANCE, 'deterministic') as solver:
+            P_i, rp_im, classification_times = load_orders(WAVE_PATH, solver.R_m)
+            orders = P_i * 3
+            with self.assertRaisesRegex(ValueError, 'exits'):
+                list(solver.solve([('too_big', (orders, rp_im, classification_times))]))
+
+if __name__ == '__main__':
+    unittest.main()
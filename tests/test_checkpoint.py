@@ -0,0 +1,71 @@
+import os
+import random
+import tempfile
+import unittest
+
+from ptl.runner import load_instance
+from random_method.heuristics import evolutionary_one_plus_one
+from local_search_method.heuristics import local_search_vns
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+# (method, parameters, should_stop calls before the preemption: local_search_vns also calls it
+# in the 1000 constructions of its initial solution)
+RUNS = [
+    (evolutionary_one_plus_one, {'max_iterations': 300}, 100),
+    (local_search_vns, {'max_iterations': 30, 'max_no_improve': 30}, 1010),
+]
+
+class Preempted(Exception):
+    pass
+
+def preempt_after(calls):
+    count = [0]
+    def should_stop(best_wmax):
+        count[0] += 1
+        if count[0] >= calls:
+            raise Preempted()
+        return False
+    return should_stop
+
+class CheckpointTest(unittest.TestCase):
+    """
+    A run preempted and resumed from its checkpoint ends with the same solution as an uninterrupted run.
+    """
+
+    def setUp(self):
+        self.args = load_instance(INSTANCE)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def solve(self, method, seed, **parameters):
+        if seed is not None:
+            random.seed(seed)
+        return method(list(self.args[0]), *self.args[1:], **parameters)
+
+    def test_resume_matches_an_uninterrupted_run(self):
+        for method, parameters, calls in RUNS:
+            with self.subTest(method=method.__name__):
+                checkpoint_path = os.path.join(self.directory.name, f'{method.__name__}.pkl')
+                uninterrupted = self.solve(method, 0, **parameters)
+
+                with self.assertRaises(Preempted):
+                    self.solve(method, 0, checkpoint_path=checkpoint_path, checkpoint_interval=0.0, should_stop=preempt_after(calls), **parameters)
+                self.assertTrue(os.path.exists(checkpoint_path))
+                resumed = self.solve(method, 1, checkpoint_path=checkpoint_path, **parameters)  # The RNG state comes from the checkpoint
+
+                self.assertEqual(resumed[:2], uninterrupted[:2])
+                self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_checkpoint_of_another_run_is_rejected(self):
+        method, parameters, calls = RUNS[0]
+        checkpoint_path = os.path.join(self.directory.name, 'run.pkl')
+        with self.assertRaises(Preempted):
+            self.solve(method, 0, checkpoint_path=checkpoint_path, checkpoint_interval=0.0, should_stop=preempt_after(calls), **parameters)
+        with self.assertRaises(ValueError):
+            self.solve(method, 0, checkpoint_path=checkpoint_path, max_iterations=parameters['max_iterations'] + 1)
+
+if __name__ == '__main__':
+    unittest.main()
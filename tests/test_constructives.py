@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance, resolve_instances
+from constructive_method.heuristics import differencing_partition, largest_differencing, longest_processing_time
+
+class DifferencingPartitionTest(unittest.TestCase):
+    """
+    Karmarkar-Karp differencing splits the orders into balanced subsets.
+    """
+
+    def test_partition_covers_every_order_once(self):
+        times = np.random.default_rng(0).uniform(1, 100, 37)
+        subsets = differencing_partition(times, 5)
+        self.assertEqual(len(subsets), 5)
+        self.assertEqual(sorted(order for subset in subsets for order in subset), list(range(37)))
+
+    def test_two_way_differencing(self):
+        # 8-7, 6-5, then 4 against the two differences of 1: subsets of 16 and 14 (LPT gives 17 and 13)
+        subsets = differencing_partition(np.array([8.0, 7.0, 6.0, 5.0, 4.0]), 2)
+        self.assertEqual(sorted(sum([8, 7, 6, 5, 4][order] for order in subset) for subset in subsets), [14, 16])
+
+    def test_perfect_three_way_split(self):
+        subsets = differencing_partition(np.array([8.0, 7.0, 6.0, 5.0, 4.0, 3.0]), 3)
+        self.assertEqual([sum([8, 7, 6, 5, 4, 3][order] for order in subset) for subset in subsets], [11, 11, 11])
+
+class ZoneConstructivesTest(unittest.TestCase):
+    """
+    LPT and differencing give valid solutions on every instance.
+    """
+
+    def test_solutions_verify(self):
+        for instance in resolve_instances(['*.xlsx']):
+            args = load_instance(instance)
+            for method in (longest_processing_time, largest_differencing):
+                with self.subTest(instance=instance, method=method.__name__):
+                    assignments, load_zones, _ = method(list(args[0]), *args[1:])
+                    verify_solution(assignments, load_zones, *args)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from shared.data_loader.data_loader import LINE_ITEMS_SHEET, load_data, load_orders, orders_from_line_items
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+def dense_orders(instance):
+    """
+    rp_im and classification times read with pandas as whole order x SKU tables, as the loader did before.
+    """
+    import pandas as pd
+
+    excel_model = pd.ExcelFile(f'shared/instances_ptl/{instance}')
+    membership = pd.read_excel(excel_model, 'SKU_pertenece_pedido', index_col=0)
+    sku_times = pd.read_excel(excel_model, 'Tiempo_SKU', index_col=0)
+    rp_im = {(order, sku): int(membership.at[order, sku]) for order in membership.index for sku in membership.columns}
+    classification_times = {order: float(sum(sku_times.at[order, sku] for sku in membership.columns if rp_im[order, sku] == 1)) for order in membership.index}
+    return rp_im, classification_times
+
+class DataLoaderTest(unittest.TestCase):
+    """
+    The sparse rp_im and the classification times match the dense order x SKU tables.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.P_i, cls.Z_j, cls.S_k, cls.R_m, _, _, cls.rp_im, _, cls.classification_times = load_data(INSTANCE)
+        cls.dense_rp_im, cls.dense_classification_times = dense_orders(INSTANCE)
+
+    def assertSameOrders(self, rp_im, classification_times):
+        for (order, sku), value in self.dense_rp_im.items():
+            self.assertEqual(rp_im.get((order, sku), 0), value, (order, sku))
+        self.assertEqual(len(rp_im), sum(value != 0 for value in self.dense_rp_im.values()))
+        self.assertEqual(classification_times.keys(), self.dense_classification_times.keys())
+        for order, time in self.dense_classification_times.items():
+            self.assertAlmostEqual(classification_times[order], time, places=9)
+
+    def test_sparse_matches_dense(self):
+        self.assertSameOrders(self.rp_im, self.classification_times)
+        for order in self.P_i:
+            self.assertEqual(self.rp_im.count_in_row(order), sum(self.dense_rp_im[order, sku] == 1 for sku in self.R_m))
+
+    def test_line_items_sheet_and_stream(self):
+        from openpyxl import Workbook, load_workbook
+
+        times = load_workbook(f'shared/instances_ptl/{INSTANCE}', read_only=True)['Tiempo_SKU']
+        header, *rows = times.iter_rows(values_only=True)
+        sku_times = {(row[0], sku): time for row in rows for sku, time in zip(header[1:], row[1:])}
+        line_items = [(order, sku, sku_times[order, sku]) for order, sku in self.rp_im]
+
+        P_i, rp_im, classification_times = orders_from_line_items(line_items, self.R_m)
+        self.assertEqual(P_i, self.P_i)
+        self.assertSameOrders(rp_im, classification_times)
+
+        workbook = Workbook()
+        workbook.active.title = 'Pedidos'
+        workbook['Pedidos'].append(['Pedido'])
+        for order in self.P_i:
+            workbook['Pedidos'].append([order])
+        workbook.create_sheet(LINE_ITEMS_SHEET).append(['Pedido', 'SKU', 'Tiempo'])
+        for line_item in line_items:
+            workbook[LINE_ITEMS_SHEET].append(list(line_item))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'wave.xlsx')
+            workbook.save(path)
+            P_i, rp_im, classification_times = load_orders(path, self.R_m)
+        self.assertEqual(P_i, self.P_i)
+        self.assertSameOrders(rp_im, classification_times)
+
+if __name__ == '__main__':
+    unittest.main()
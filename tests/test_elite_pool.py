@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from shared.utils import verify_solution
+from shared.solution import Solution, instance_arrays
+from shared.elite_pool import ElitePool, path_relinking, relink_pool, solution_distance
+from ptl.runner import load_instance
+from constructive_method.heuristics import grasp
+
+INSTANCE = '60_heterogeneous.xlsx'
+
+class ElitePoolTest(unittest.TestCase):
+    """
+    The elite pool keeps the best distinct solutions, and path relinking combines them into valid solutions.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.args = load_instance(INSTANCE)
+        P_i, Z_j, S_k = cls.args[:3]
+        cls.num_skus, cls.times, cls.travel, exit_zone, _ = instance_arrays(*cls.args)
+        cls.solutions = []
+        for seed in range(8):
+            random.seed(seed)
+            assignments, load_zones, _ = grasp(list(P_i), *cls.args[1:], N=1, local_search_moves=0)
+            cls.solutions.append(Solution.from_assignments(assignments, load_zones, P_i, Z_j, S_k, exit_zone))
+
+    def test_pool_keeps_the_best_distinct_solutions(self):
+        pool = ElitePool(size=4)
+        for solution in self.solutions:
+            pool.add(solution)
+        self.assertFalse(pool.add(pool.best.copy()))  # Duplicate
+
+        wmax_values = [elite.wmax for elite in pool]
+        self.assertEqual(len(pool), 4)
+        self.assertEqual(wmax_values, sorted(wmax_values))
+        self.assertEqual(pool.best.wmax, min(solution.wmax for solution in self.solutions))
+
+    def test_path_relinking_returns_an_intermediate_valid_solution(self):
+        initiating, guiding = self.solutions[:2]
+        initiating_before, guiding_before = initiating.copy(), guiding.copy()
+        self.assertGreater(solution_distance(initiating, guiding), 2)
+
+        relinked = path_relinking(initiating, guiding, self.travel, self.times, self.num_skus)
+
+        verify_solution(*relinked.to_assignments(), *self.args)
+        self.assertGreater(solution_distance(relinked, initiating), 0)
+        self.assertGreater(solution_distance(relinked, guiding), 0)
+        self.assertEqual(solution_distance(initiating, initiating_before), 0)  # The endpoints are not modified
+        self.assertEqual(solution_distance(guiding, guiding_before), 0)
+
+    def test_relink_pool_never_worsens_the_best(self):
+        pool = ElitePool(size=4)
+        for solution in self.solutions:
+            pool.add(solution.copy())
+        best_wmax = pool.best.wmax
+
+        best = relink_pool(pool, self.travel, self.times, self.num_skus)
+
+        verify_solution(*best.to_assignments(), *self.args)
+        self.assertLessEqual(best.wmax, best_wmax)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from constructive_method.heuristics import grasp
+
+INSTANCE = '60_heterogeneous.xlsx'
+
+class GraspTest(unittest.TestCase):
+    """
+    GRASP returns a valid solution, reproducible with the same seed.
+    """
+
+    def setUp(self):
+        self.args = load_instance(INSTANCE)
+
+    def solve(self, seed, **parameters):
+        random.seed(seed)
+        return grasp(list(self.args[0]), *self.args[1:], **parameters)
+
+    def test_solution_verifies_and_stats_are_consistent(self):
+        assignments, load_zones, _, stats = self.solve(0, N=20, collect_stats=True)
+        verify_solution(assignments, load_zones, *self.args)
+        self.assertAlmostEqual(stats.trajectory[-1][1], max(load_zones.values()))
+        self.assertLessEqual(stats.moves_accepted, stats.moves_proposed)
+
+    def test_same_seed_same_solution(self):
+        self.assertEqual(self.solve(3, N=10)[:2], self.solve(3, N=10)[:2])
+
+    def test_more_constructions_never_worsen_wmax(self):
+        # The first 5 constructions of a seed are the same, so 20 can only find a better solution
+        self.assertLessEqual(max(self.solve(1, N=20)[1].values()), max(self.solve(1, N=5)[1].values()))
+
+    def test_needs_one_construction(self):
+        with self.assertRaises(ValueError):
+            self.solve(0, N=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules of the solving path: the loader and every heuristics module
+SOLVING_MODULES = [
+    'shared.data_loader.data_loader',
+    'constructive_method.heuristics',
+    'random_method.heuristics',
+    'local_search_method.heuristics',
+    'tabu_search_method.heuristics',
+    'lns_method.heuristics',
+]
+
+# Libraries that must only be imported when an instance is read, a report is generated or the tests run
+HEAVY_MODULES = ['pandas', 'matplotlib', 'PIL', 'scipy']
+
+IMPORT_TIME_BUDGET = 1.0  # Seconds, most of it numpy (about 0.15 s here)
+
+class ImportTimeTest(unittest.TestCase):
+    """
+    Importing the solving path in a fresh interpreter stays cheap and free of the heavy libraries.
+    """
+
+    def test_solving_path_imports_within_budget(self):
+        script = (
+            'import sys, json, time, importlib\n'
+            'start = time.perf_counter()\n'
+            f'for module in {SOLVING_MODULES!r}:\n'
+            '    importlib.import_module(module)\n'
+            'elapsed = time.perf_counter() - start\n'
+            f'print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n'
+        )
+        completed = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(result['loaded'], [], f"The solving path imports {', '.join(result['loaded'])}.")
+        self.assertLess(result['elapsed'], IMPORT_TIME_BUDGET, f"The solving path takes {result['elapsed']:.3f} s to import.")
+
+if __name__ == '__main__':
+    unittest.main()
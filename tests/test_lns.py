@@ -0,0 +1,39 @@
+import random
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+from lns_method.heuristics import zone_decomposition_lns
+
+class ZoneDecompositionLnsTest(unittest.TestCase):
+    """
+    The LNS returns a valid solution that is never worse than its nearest neighbor start.
+    """
+
+    def test_solution_verifies_and_improves_on_the_start(self):
+        for instance in ('40_heterogeneous.xlsx', '60_homogeneous.xlsx'):
+            with self.subTest(instance=instance):
+                args = load_instance(instance)
+                _, start_load_zones, _ = nearest_neighbor_minimize_max_workload_time(list(args[0]), *args[1:])
+                random.seed(0)
+                assignments, load_zones, _ = zone_decomposition_lns(list(args[0]), *args[1:], max_iterations=5)
+
+                verify_solution(assignments, load_zones, *args)
+                self.assertLessEqual(max(load_zones.values()), max(start_load_zones.values()) + 1e-9)
+
+    def test_should_stop_is_checked_before_each_repair(self):
+        args = load_instance('80_heterogeneous.xlsx')
+        calls = []
+        def should_stop(best_wmax):
+            calls.append(best_wmax)
+            return len(calls) >= 3  # Check of the first iteration, first repair, then stop before the second
+
+        random.seed(0)
+        assignments, load_zones, _, stats = zone_decomposition_lns(list(args[0]), *args[1:], should_stop=should_stop, collect_stats=True)
+
+        verify_solution(assignments, load_zones, *args)
+        self.assertEqual(stats.moves_proposed, 1)  # Only the first sub-problem was repaired
+
+if __name__ == '__main__':
+    unittest.main()
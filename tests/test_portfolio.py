@@ -0,0 +1,47 @@
+import os
+import json
+import tempfile
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from ptl.portfolio import Portfolio, size_class
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class PortfolioTest(unittest.TestCase):
+    """
+    The portfolio returns the best verified solution of its methods and learns a prior per size class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.prior_path = os.path.join(self.directory.name, 'prior.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_size_classes_group_similar_sizes(self):
+        self.assertEqual(size_class(40), size_class(60))
+        self.assertEqual(size_class(64), size_class(127))
+        self.assertNotEqual(size_class(63), size_class(64))
+
+    def test_solve_returns_the_best_run_and_records_it(self):
+        portfolio = Portfolio(['deterministic', 'lpt', 'tabu_search'], prior_path=self.prior_path)
+        (assignments, load_zones, _, instance_name, method_name), runs = portfolio.solve(INSTANCE, deadline=5.0, seed=0)
+
+        verify_solution(assignments, load_zones, *load_instance(INSTANCE))
+        self.assertEqual(instance_name, '40_heterogeneous')
+        self.assertEqual(max(load_zones.values()), min(run['wmax'] for run in runs.values()))
+        with open(self.prior_path) as file:
+            self.assertEqual(json.load(file), {size_class(40): {method_name: 1}})
+
+    def test_prior_ranks_the_methods(self):
+        with open(self.prior_path, 'w') as file:
+            json.dump({size_class(60): {'tabu_search': 3, 'lpt': 1}}, file)
+        portfolio = Portfolio(['deterministic', 'lpt', 'tabu_search'], prior_path=self.prior_path, max_methods=2)
+        self.assertEqual(portfolio.ranked_methods(40), ['tabu_search', 'lpt'])
+        self.assertEqual(portfolio.ranked_methods(80), ['deterministic', 'lpt'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from shared.result_cache import ResultCache
+from ptl.methods import DEFAULT_PARAMETERS
+from ptl.runner import run_job
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class ResultCacheTest(unittest.TestCase):
+    """
+    Seeded runs are reused from the cache, keyed by what changes their solution, and the least
+    recently used entries are evicted.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def entries(self):
+        return sorted(filename for _, _, files in os.walk(self.directory.name) for filename in files)
+
+    def test_hit_returns_the_stored_run(self):
+        first, _ = run_job(INSTANCE, 'grasp', {'N': 5}, 0, cache=self.cache)
+        second, _ = run_job(INSTANCE, 'grasp', {'N': 5}, 0, cache=self.cache)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual(first[:3], second[:3])  # Same execution time: the stored run
+
+    def test_key_ignores_how_the_parameters_are_given(self):
+        run_job(INSTANCE, 'grasp', {'N': 100}, 0, cache=self.cache)
+        run_job(INSTANCE, 'grasp', DEFAULT_PARAMETERS['grasp'], 0, cache=self.cache)
+        run_job(INSTANCE, 'evolutionary', {'max_iterations': 50}, 0, cache=self.cache)
+        run_job(INSTANCE, 'evolutionary', {'max_iterations': 50, 'checkpoint_interval': 5.0}, 0, cache=self.cache)
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_key_changes_with_parameters_and_seed(self):
+        run_job(INSTANCE, 'grasp', {'N': 5}, 0, cache=self.cache)
+        run_job(INSTANCE, 'grasp', {'N': 6}, 0, cache=self.cache)
+        run_job(INSTANCE, 'grasp', {'N': 5}, 1, cache=self.cache)
+        self.assertEqual(len(self.entries()), 3)
+
+    def test_evict_removes_least_recently_used_entries_only(self):
+        keys = [f'{index:02x}' + 'a' * 62 for index in range(4)]
+        for age, key in enumerate(keys):
+            self.cache.put(key, {'P1': ('Z1', 'S1', 1.0)}, {'Z1': 1.0}, 0.1)
+            path = f'{self.directory.name}/{key[:2]}/{key}.json'
+            os.utime(path, (1000 + age, 1000 + age))
+        entry_size = os.path.getsize(path)
+        with open(f'{self.directory.name}/portfolio_prior.json', 'w') as file:
+            file.write('{}')
+        self.cache.get(keys[0])  # A hit makes the oldest entry the most recently used
+
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.evict()
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNone(self.cache.get(keys[2]))
+        self.assertIsNotNone(self.cache.get(keys[3]))
+        self.assertTrue(os.path.exists(f'{self.directory.name}/portfolio_prior.json'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+
+from shared.search_stats import SearchStats
+from ptl.runner import load_instance
+
+from random_method.heuristics import evolutionary_one_plus_one
+from local_search_method.heuristics import local_search_vns
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class Preempted(Exception):
+    pass
+
+def preempt_after(calls):
+    """
+    should_stop hook that kills the run (raises) on its calls-th call, like a preemption.
+    """
+    count = [0]
+    def should_stop(best_wmax):
+        count[0] += 1
+        if count[0] >= calls:
+            raise Preempted()
+        return False
+    return should_stop
+
+class SearchStatsTest(unittest.TestCase):
+    """
+    Searches called with collect_stats=True return a SearchStats object whose trajectory is never empty.
+    """
+
+    def setUp(self):
+        self.args = load_instance(INSTANCE)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def solve(self, method, **parameters):
+        return method(list(self.args[0]), *self.args[1:], **parameters)
+
+    def test_stats_follow_the_solution(self):
+        for method, parameters in ((evolutionary_one_plus_one, {'max_iterations': 200}), (local_search_vns, {'max_iterations': 20})):
+            with self.subTest(method=method.__name__):
+                random.seed(0)
+                assignments, load_zones, execution_time, stats = self.solve(method, collect_stats=True, **parameters)
+                self.assertIsInstance(stats, SearchStats)
+                self.assertAlmostEqual(stats.trajectory[-1][1], max(load_zones.values()))
+                self.assertLessEqual(stats.moves_accepted, stats.moves_proposed)
+
+    def test_resume_with_stats_from_a_checkpoint_without_stats(self):
+        # local_search_vns also calls should_stop in the 1000 constructions of its initial solution
+        for method, parameters, calls in ((evolutionary_one_plus_one, {'max_iterations': 200}, 5), (local_search_vns, {'max_iterations': 20}, 1005)):
+            with self.subTest(method=method.__name__):
+                checkpoint_path = os.path.join(self.directory.name, f'{method.__name__}.pkl')
+                random.seed(0)
+                with self.assertRaises(Preempted):
+                    self.solve(method, checkpoint_path=checkpoint_path, checkpoint_interval=0.0, should_stop=preempt_after(calls), **parameters)
+                self.assertTrue(os.path.exists(checkpoint_path))
+
+                # Stopped right after the resume, so the search adds nothing to the trajectory
+                _, load_zones, _, stats = self.solve(method, checkpoint_path=checkpoint_path, collect_stats=True, should_stop=lambda best_wmax: True, **parameters)
+                self.assertEqual(len(stats.trajectory), 1)
+                self.assertAlmostEqual(stats.trajectory[-1][1], max(load_zones.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import asyncio
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from ptl.service import SolverService
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class SolverServiceTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Status codes of POST /solve on a service with one warm worker.
+    """
+
+    async def asyncSetUp(self):
+        self.service = SolverService([INSTANCE], workers=1)
+        await self.service.start()
+        self.server = await asyncio.start_server(self.service.handle_connection, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+
+    async def post(self, payload):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        body = json.dumps(payload).encode()
+        writer.write(f'POST /solve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        status_line, _, response_body = response.partition(b'\r\n\r\n')
+        return int(status_line.split()[1]), json.loads(response_body)
+
+    async def test_budgeted_search_returns_its_solution(self):
+        parameters = {'max_iterations': 10 ** 6, 'max_no_improve': 10 ** 6}  # Only the budget stops them
+        for method_name in ('tabu_search', 'lns'):  # LNS overshoots the budget by up to one MILP repair
+            with self.subTest(method=method_name):
+                status, response = await self.post({'instance': INSTANCE, 'method': method_name, 'parameters': parameters, 'budget': 1})
+
+                self.assertEqual(status, 200, response)
+                assignments = {order: tuple(assignment) for order, assignment in response['assignments'].items()}
+                verify_solution(assignments, response['load_zones'], *load_instance(INSTANCE))
+                self.assertAlmostEqual(response['wmax'], max(response['load_zones'].values()))
+                self.assertEqual(self.service.metrics()['in_flight'], 0)
+
+    async def test_invalid_requests_get_400(self):
+        for payload in ([1], {'instance': INSTANCE}, {'instance': INSTANCE, 'method': 'unknown'}, {'instance': INSTANCE, 'method': 'grasp', 'parameters': {'unknown': 1}}):
+            status, _ = await self.post(payload)
+            self.assertEqual(status, 400, payload)
+
+    async def test_expired_budget_gets_504(self):
+        status, _ = await self.post({'instance': INSTANCE, 'method': 'deterministic', 'budget': 0})
+        self.assertEqual(status, 504)
+        self.assertEqual(self.service.metrics()['timed_out'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
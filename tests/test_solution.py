@@ -0,0 +1,62 @@
+import random
+import unittest
+
+import numpy as np
+
+from shared.utils import verify_solution
+from shared.solution import Solution, evaluate_bottleneck_moves, instance_arrays
+from ptl.runner import load_instance
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class SolutionTest(unittest.TestCase):
+    """
+    The incremental updates of Solution match a full re-evaluation of the assignment.
+    """
+
+    def setUp(self):
+        self.args = load_instance(INSTANCE)
+        P_i, Z_j, S_k = self.args[:3]
+        self.num_skus, self.times, self.travel, exit_zone, _ = instance_arrays(*self.args)
+        assignments, load_zones, _ = nearest_neighbor_minimize_max_workload_time(list(P_i), *self.args[1:])
+        self.assignments, self.load_zones = assignments, load_zones
+        self.solution = Solution.from_assignments(assignments, load_zones, P_i, Z_j, S_k, exit_zone)
+
+    def full_loads(self, solution):
+        costs = self.times + self.num_skus * self.travel[solution.order_exit]
+        return costs, np.bincount(solution.exit_zone[solution.order_exit], weights=costs, minlength=len(solution.Z_j))
+
+    def test_round_trip(self):
+        assignments, load_zones = self.solution.to_assignments()
+        self.assertEqual(assignments, self.assignments)
+        for zone, load in self.load_zones.items():
+            self.assertAlmostEqual(load_zones[zone], load)
+
+    def test_apply_move_matches_full_evaluation(self):
+        rng = random.Random(0)
+        zone_exits = np.flatnonzero(self.solution.exit_zone >= 0)
+        for _ in range(200):
+            self.solution.apply_move(rng.randrange(len(self.solution.P_i)), int(rng.choice(zone_exits)), self.travel, self.times, self.num_skus)
+
+        costs, loads = self.full_loads(self.solution)
+        np.testing.assert_allclose(self.solution.order_cost, costs)
+        np.testing.assert_allclose(self.solution.zone_load, loads)
+        np.testing.assert_array_equal(self.solution.exit_order[self.solution.order_exit], np.arange(len(self.solution.P_i)))
+        verify_solution(*self.solution.to_assignments(), *self.args)
+
+    def test_bottleneck_moves_match_applied_moves(self):
+        bottleneck = int(np.argmax(self.solution.zone_load))
+        orders, exits, new_wmax = evaluate_bottleneck_moves(self.solution, bottleneck, self.travel, self.times, self.num_skus)
+        self.assertTrue(np.all(self.solution.exit_zone[self.solution.order_exit[orders]] == bottleneck))
+
+        for o, order in enumerate(orders):
+            for e, exit_ in enumerate(exits):
+                if not np.isfinite(new_wmax[o, e]):
+                    continue
+                moved = self.solution.copy()
+                moved.apply_move(int(order), int(exit_), self.travel, self.times, self.num_skus)
+                self.assertAlmostEqual(new_wmax[o, e], self.full_loads(moved)[1].max(), places=6)
+
+if __name__ == '__main__':
+    unittest.main()
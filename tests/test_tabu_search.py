@@ -0,0 +1,31 @@
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+from tabu_search_method.heuristics import tabu_search
+
+class TabuSearchTest(unittest.TestCase):
+    """
+    Tabu search returns a valid, deterministic solution that is never worse than its nearest neighbor start.
+    """
+
+    def test_solution_verifies_and_improves_on_the_start(self):
+        for instance in ('40_heterogeneous.xlsx', '80_homogeneous.xlsx'):
+            with self.subTest(instance=instance):
+                args = load_instance(instance)
+                _, start_load_zones, _ = nearest_neighbor_minimize_max_workload_time(list(args[0]), *args[1:])
+                assignments, load_zones, _, stats = tabu_search(list(args[0]), *args[1:], max_iterations=300, collect_stats=True)
+
+                verify_solution(assignments, load_zones, *args)
+                self.assertLessEqual(max(load_zones.values()), max(start_load_zones.values()) + 1e-9)
+                self.assertAlmostEqual(stats.trajectory[-1][1], max(load_zones.values()))
+
+    def test_is_deterministic(self):
+        args = load_instance('60_heterogeneous.xlsx')
+        first = tabu_search(list(args[0]), *args[1:], max_iterations=200)
+        second = tabu_search(list(args[0]), *args[1:], max_iterations=200)
+        self.assertEqual(first[:2], second[:2])
+
+if __name__ == '__main__':
+    unittest.main()
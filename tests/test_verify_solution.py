@@ -0,0 +1,53 @@
+import unittest
+
+from shared.utils import verify_solution
+from ptl.runner import load_instance
+from constructive_method.heuristics import nearest_neighbor_minimize_max_workload_time
+
+INSTANCE = '40_heterogeneous.xlsx'
+
+class VerifySolutionTest(unittest.TestCase):
+    """
+    verify_solution accepts a valid solution and rejects each kind of corruption with a ValueError.
+    """
+
+    def setUp(self):
+        self.args = load_instance(INSTANCE)
+        self.assignments, self.load_zones, _ = nearest_neighbor_minimize_max_workload_time(list(self.args[0]), *self.args[1:])
+        self.orders = list(self.assignments)
+
+    def assertRejected(self, assignments, load_zones, message):
+        with self.assertRaisesRegex(ValueError, message):
+            verify_solution(assignments, load_zones, *self.args)
+
+    def test_valid_solution(self):
+        self.assertTrue(verify_solution(self.assignments, self.load_zones, *self.args))
+
+    def test_missing_order(self):
+        assignments = dict(self.assignments)
+        del assignments[self.orders[0]]
+        self.assertRejected(assignments, self.load_zones, 'number of assignments')
+
+    def test_duplicate_exit(self):
+        first, second = self.orders[:2]
+        assignments = dict(self.assignments)
+        assignments[second] = (assignments[second][0], assignments[first][1], assignments[second][2])
+        self.assertRejected(assignments, self.load_zones, 'Duplicate exits')
+
+    def test_exit_of_another_zone(self):
+        order = self.orders[0]
+        zone, exit_, cost = self.assignments[order]
+        other_zone = next(z for z in self.args[1] if z != zone)
+        self.assertRejected({**self.assignments, order: (other_zone, exit_, cost)}, self.load_zones, 'does not belong to zone')
+
+    def test_wrong_classification_time(self):
+        order = self.orders[0]
+        zone, exit_, cost = self.assignments[order]
+        self.assertRejected({**self.assignments, order: (zone, exit_, cost + 1.0)}, self.load_zones, 'Classification time')
+
+    def test_wrong_zone_load(self):
+        zone = self.args[1][0]
+        self.assertRejected(self.assignments, {**self.load_zones, zone: self.load_zones[zone] + 1.0}, 'Load of zone')
+
+if __name__ == '__main__':
+    unittest.main()